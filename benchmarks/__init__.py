@@ -0,0 +1,14 @@
+"""Local benchmarks for the trexjacket proxy layer.
+
+The modules in this package run on plain CPython, without Anvil or Tableau:
+
+* ``mock_tableau`` is a scriptable fake of ``anvil.tableau.extensions`` (and the
+  handful of ``anvil`` modules the library imports).
+* ``synthetic`` generates fake Tableau data tables, domains and parameters.
+* ``__main__`` is the benchmark suite itself.
+
+Run the suite from the root of the repository::
+
+    python -m benchmarks
+    python -m benchmarks --sizes 1000 1000000 --only get_records
+"""
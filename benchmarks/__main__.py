@@ -0,0 +1,285 @@
+"""Micro-benchmarks for the hot paths of the proxy layer.
+
+Each case reports its best wall time over ``--repeat`` runs, the resulting
+throughput and the peak memory allocated while it ran (measured in a separate,
+traced run so that tracing does not distort the timings).
+"""
+import argparse
+import contextlib
+import gc
+import io
+import time
+import tracemalloc
+
+from . import mock_tableau, synthetic
+
+_cases = []
+
+
+def case(name, sizes=synthetic.SIZES[:3], unit="rows"):
+    """Registers a benchmark case.
+
+    The decorated function takes ``(host, size)``, does any setup that should not be
+    measured, and returns the zero-argument callable to measure.
+    """
+
+    def register(setup):
+        _cases.append((name, sizes, unit, setup))
+        return setup
+
+    return register
+
+
+@case("get_records")
+def _get_records(host, size):
+    from trexjacket.model.proxies import DataTable
+
+    table = DataTable(synthetic.make_table(size))
+    return table.get_records
+
+
+@case("get_rows")
+def _get_rows(host, size):
+    from trexjacket.model.proxies import DataTable
+
+    table = DataTable(synthetic.make_table(size))
+    return table.get_rows
+
+
+@case("get_columns")
+def _get_columns(host, size):
+    from trexjacket.model.proxies import DataTable
+
+    source = synthetic.make_table(size)
+    return lambda: DataTable(source).get_columns()
+
+
+@case("export_csv")
+def _export_csv(host, size):
+    from trexjacket import api
+
+    host.dashboard.add_worksheet("Orders", summary=synthetic.make_table(size))
+    worksheet = api.get_dashboard().get_worksheet("Orders")
+    return lambda: worksheet.export_csv(summary=True)
+
+
+@case("cleanup_measures")
+def _cleanup_measures(host, size):
+    from trexjacket.model._utils import cleanup_measures
+    from trexjacket.model.proxies import DataTable
+
+    table = DataTable(synthetic.make_measure_names_table(size))
+    with contextlib.redirect_stdout(io.StringIO()):
+        records = table.get_records()
+    return lambda: cleanup_measures(list(records))
+
+
+@case("suppress_duplicate_events", sizes=(1_000, 10_000), unit="events")
+def _suppress_duplicate_events(host, size):
+    from trexjacket.model import proxies
+
+    fields = [f"Field {i}" for i in range(20)]
+    events = [
+        proxies.FilterChangedEvent(
+            mock_tableau.JSObject(fieldName=fields[i % len(fields)])
+        )
+        for i in range(size)
+    ]
+
+    def run():
+        handler = proxies._suppress_duplicate_events(lambda event: None)
+        for event in events:
+            handler(event)
+
+    return run
+
+
+@case("event_worksheet_lookup", sizes=(1_000, 10_000), unit="events")
+def _event_worksheet_lookup(host, size):
+    from trexjacket.model import proxies
+
+    sheet = host.dashboard.add_worksheet("Sales")
+    events = [
+        proxies.FilterChangedEvent(
+            mock_tableau.JSObject(fieldName="Region", _worksheet=sheet)
+        )
+        for _ in range(size)
+    ]
+
+    def run():
+        for event in events:
+            event.worksheet.name
+
+    return run
+
+
+@case("parameter_allowable_values", sizes=(1_000, 10_000, 100_000), unit="values")
+def _parameter_allowable_values(host, size):
+    from trexjacket import api
+
+    allowable = {"type": "list", "values": [float(i) for i in range(size)]}
+    host.dashboard.add_parameter("Target", 0.0, "float", allowable)
+    parameter = api.get_dashboard().get_parameter("Target")
+
+    def run():
+        for _ in range(10):
+            parameter.allowable_values
+
+    return run
+
+
+@case("categorical_filter_domain", unit="values")
+def _categorical_filter_domain(host, size):
+    from trexjacket import api
+
+    sheet = host.dashboard.add_worksheet("Customers")
+    sheet.add_categorical_filter("Customer Name", synthetic.make_domain(size))
+    filter = api.get_dashboard().get_worksheet("Customers").get_filter("Customer Name")
+
+    def run():
+        filter.applied_values
+        filter.get_domain("relevant")
+        filter.describe()
+
+    return run
+
+
+@case("domain_search", unit="values")
+def _domain_search(host, size):
+    from trexjacket.model.search import SearchableDomain
+
+    domain = SearchableDomain(synthetic.make_domain(size))
+    domain.search("nn", mode="substring")
+    queries = ["a", "an", "ann", "ann 0", "bob 00", "xyz"]
+
+    def run():
+        for query in queries:
+            domain.search(query)
+            domain.search(query, mode="substring")
+
+    return run
+
+
+@case("query_group_top")
+def _query_group_top(host, size):
+    from trexjacket.model.proxies import DataTable
+
+    source = synthetic.make_table(size)
+
+    def run():
+        table = DataTable(source)
+        table.query().where("Quantity", lambda q: q > 5).group_by("Region").agg(
+            total=("sum", "SUM(Measure 0)"), customers=("distinct", "Customer Name")
+        ).records()
+        table.query().top(10, "SUM(Measure 1)").select("Order ID").records()
+
+    return run
+
+
+@case("index_lookup_many")
+def _index_lookup_many(host, size):
+    from trexjacket.model.proxies import DataTable
+
+    table = DataTable(synthetic.make_table(size))
+    keys = [f"ORD-{i:07d}" for i in range(0, size, 7)]
+
+    def run():
+        table._indexes.clear()
+        table.index("Order ID").lookup_many(keys, ["Order ID", "Quantity"])
+
+    return run
+
+
+@case("summary_changes")
+def _summary_changes(host, size):
+    from trexjacket.model.diff import SummarySnapshot
+    from trexjacket.model.proxies import DataTable
+
+    before = DataTable(synthetic.make_table(size, seed=0)).get_records()
+    after = DataTable(synthetic.make_table(size, seed=1)).get_records()
+
+    def run():
+        snapshot = SummarySnapshot()
+        snapshot.update(before)
+        snapshot.update(after)
+
+    return run
+
+
+@case("bind_unbind_handlers", sizes=(10, 100, 1_000), unit="handlers")
+def _bind_unbind_handlers(host, size):
+    from trexjacket import api
+
+    for i in range(20):
+        host.dashboard.add_worksheet(f"Sheet {i}")
+        host.dashboard.add_parameter(f"Parameter {i}", i)
+    dashboard = api.get_dashboard()
+    handlers = [lambda event: None for _ in range(size)]
+
+    def run():
+        for handler in handlers:
+            dashboard.register_event_handler("filter_changed", handler)
+            dashboard.register_event_handler("parameter_changed", handler)
+        dashboard.unregister_all_event_handlers()
+
+    return run
+
+
+@case("settings_round_trip", sizes=(10, 100, 1_000), unit="keys")
+def _settings_round_trip(host, size):
+    from trexjacket.model.proxies import Settings
+
+    settings = Settings(host.settings)
+    values = {f"key {i}": {"value": i, "label": str(i)} for i in range(size)}
+
+    def run():
+        settings.update(values)
+        for key in values:
+            settings[key]
+
+    return run
+
+
+def _measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", help="override all sizes")
+    parser.add_argument("--only", nargs="+", help="names of the cases to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per host round trip"
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<32}{'size':>10}{'seconds':>12}{'per second':>20}{'peak MiB':>12}")
+    for name, sizes, unit, setup in _cases:
+        if args.only and name not in args.only:
+            continue
+        for size in args.sizes or sizes:
+            host = mock_tableau.install(latency=args.latency)
+            fn = setup(host, size)
+            seconds, peak = _measure(fn, args.repeat)
+            rate = f"{size / seconds:,.0f} {unit}" if seconds else "-"
+            print(
+                f"{name:<32}{size:>10,}{seconds:>12.4f}{rate:>20}"
+                f"{peak / 2**20:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,702 @@
+"""A scriptable fake of the Tableau Extensions API, as seen through ``anvil.js``.
+
+Anvil awaits JS promises automatically, so every ``...Async`` method here simply
+returns its result. JS objects support both attribute and item access, which is
+mirrored by :class:`JSObject`.
+
+Example
+-------
+>>> from benchmarks import mock_tableau, synthetic
+>>> host = mock_tableau.install(latency=0.002)
+>>> host.dashboard.add_worksheet("Sales", summary=synthetic.make_table(1000))
+>>> from trexjacket import api
+>>> api.get_dashboard().get_worksheet("Sales").get_summary_data()
+"""
+import collections
+import datetime as dt
+import os
+import sys
+import time
+import types
+
+CLIENT_CODE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "client_code")
+
+
+class JSObject:
+    """A plain JS object: attributes can also be read with ``obj["name"]``."""
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        return f"JSObject({self.__dict__})"
+
+
+class JSDate:
+    """The parts of a JS ``Date`` used by the library."""
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value):
+        if isinstance(value, (int, float)):
+            value = dt.datetime(1970, 1, 1) + dt.timedelta(milliseconds=value)
+        elif type(value) is dt.date:
+            value = dt.datetime(value.year, value.month, value.day)
+        self._value = value
+
+    @staticmethod
+    def UTC(year, month, day=1, hour=0, minute=0, second=0):
+        value = dt.datetime(year, month + 1, day, hour, minute, second)
+        return (value - dt.datetime(1970, 1, 1)) // dt.timedelta(milliseconds=1)
+
+    def toISOString(self):
+        return self._value.strftime("%Y-%m-%dT%H:%M:%S.") + "%03dZ" % (
+            self._value.microsecond // 1000
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, JSDate) and self._value == other._value
+
+    def __hash__(self):
+        return hash(self._value)
+
+
+def to_native(value):
+    """Returns what Tableau would report as the ``nativeValue`` of a python value."""
+    if isinstance(value, (dt.date, dt.datetime)):
+        return JSDate(value)
+    return value
+
+
+def from_native(value):
+    if isinstance(value, JSDate):
+        return value._value
+    return value
+
+
+class DataValue:
+    __slots__ = ("value", "nativeValue", "formattedValue")
+
+    def __init__(self, value, formatted=None):
+        self.value = value
+        self.nativeValue = to_native(value)
+        self.formattedValue = str(value) if formatted is None else formatted
+
+
+class Column:
+    __slots__ = ("fieldName", "fieldId", "dataType", "index", "isReferenced")
+
+    def __init__(self, field_name, data_type, index):
+        self.fieldName = field_name
+        self.fieldId = f"[{field_name}]"
+        self.dataType = data_type
+        self.index = index
+        self.isReferenced = True
+
+
+class DataTable(JSObject):
+    """A Tableau DataTable. ``rows`` is a list of lists of python values."""
+
+    def __init__(self, columns, rows, name="Table", is_summary=False):
+        columns = [
+            c if isinstance(c, Column) else Column(c[0], c[1], i)
+            for i, c in enumerate(columns)
+        ]
+        super().__init__(
+            name=name,
+            columns=columns,
+            data=[
+                [v if isinstance(v, DataValue) else DataValue(v) for v in row]
+                for row in rows
+            ],
+            totalRowCount=len(rows),
+            isSummaryData=is_summary,
+            marks=None,
+        )
+
+    def sliced(self, options=None):
+        """A copy restricted by the options accepted by the ``...DataAsync`` calls."""
+        options = options or {}
+        columns, data = self.columns, self.data
+        ids = options.get("columnsToIncludeById")
+        if ids:
+            keep = [c.index for c in columns if c.fieldId in ids]
+            columns = [
+                Column(columns[i].fieldName, columns[i].dataType, n)
+                for n, i in enumerate(keep)
+            ]
+            data = [[row[i] for i in keep] for row in data]
+        max_rows = options.get("maxRows") or 0
+        if max_rows:
+            data = data[:max_rows]
+        table = DataTable(columns, [], name=self.name, is_summary=self.isSummaryData)
+        table.data = data
+        table.totalRowCount = len(data)
+        return table
+
+
+class DataTableReader(JSObject):
+    """Pages through a DataTable, as returned by the ``...DataReaderAsync`` calls."""
+
+    def __init__(self, host, table, page_row_count):
+        super().__init__(
+            totalRowCount=len(table.data),
+            pageCount=-(-len(table.data) // page_row_count),
+        )
+        self._host = host
+        self._table = table
+        self._page_row_count = page_row_count
+        self.released = False
+
+    def getPageAsync(self, page_number):
+        self._host.round_trip("getPageAsync")
+        if self.released or not 0 <= page_number < self.pageCount:
+            raise ValueError(f"invalid page {page_number}")
+        start = page_number * self._page_row_count
+        page = DataTable(self._table.columns, [], name=self._table.name)
+        page.data = self._table.data[start : start + self._page_row_count]
+        page.totalRowCount = len(page.data)
+        return page
+
+    def releaseAsync(self):
+        self._host.round_trip("releaseAsync")
+        self.released = True
+
+
+class Blob:
+    """A JS Blob: ``parts`` are strings or other blobs."""
+
+    def __init__(self, parts, options=None):
+        self.parts = list(parts)
+        self.type = (options or {}).get("type", "")
+
+    def text(self):
+        return "".join(p.text() if isinstance(p, Blob) else p for p in self.parts)
+
+    @property
+    def size(self):
+        return len(self.text().encode())
+
+
+class Media:
+    """What ``anvil.js.to_media`` makes of a Blob."""
+
+    def __init__(self, blob, content_type=None, name=None):
+        self.content_type = content_type or blob.type
+        self.name = name
+        self._blob = blob
+
+    def get_bytes(self):
+        return self._blob.text().encode()
+
+
+class LocalStorage:
+    """The browser's ``localStorage``, which holds strings."""
+
+    def __init__(self):
+        self.items = {}
+
+    def getItem(self, key):
+        return self.items.get(key)
+
+    def setItem(self, key, value):
+        self.items[key] = str(value)
+
+    def removeItem(self, key):
+        self.items.pop(key, None)
+
+
+class BlobMedia:
+    """``anvil.BlobMedia``."""
+
+    def __init__(self, content_type, content, name=None):
+        self.content_type = content_type
+        self.name = name
+        self._content = content
+
+    def get_bytes(self):
+        return self._content
+
+
+class _LessThan:
+    def __init__(self, value):
+        self.value = value
+
+    def matches(self, value):
+        return value is not None and value < self.value
+
+
+class Row(dict):
+    """A row of an :class:`AppTable`."""
+
+    def __init__(self, table, values):
+        super().__init__(values)
+        self._table = table
+
+    def update(self, **values):
+        super().update(values)
+
+    def delete(self):
+        self._table.rows.remove(self)
+
+
+class AppTable:
+    """An in-memory Anvil Data Table, with the parts of its interface in use."""
+
+    def __init__(self):
+        self.rows = []
+
+    def add_row(self, **values):
+        row = Row(self, values)
+        self.rows.append(row)
+        return row
+
+    def search(self, **query):
+        return [
+            row
+            for row in self.rows
+            if all(
+                test.matches(row.get(column))
+                if isinstance(test, _LessThan)
+                else row.get(column) == test
+                for column, test in query.items()
+            )
+        ]
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class _AppTables:
+    """``anvil.tables.app_tables``: tables are created on first use."""
+
+    def __getattr__(self, name):
+        table = self.__dict__[name] = AppTable()
+        return table
+
+
+class Host:
+    """Shared configuration and bookkeeping of the fake host.
+
+    Attributes
+    ----------
+    latency : float
+        Seconds every ``...Async`` call sleeps for before returning.
+    calls : collections.Counter
+        Number of host round trips, keyed on method name.
+    delays : list
+        The delay in milliseconds of each ``setTimeout`` call, in order.
+    local_storage : LocalStorage
+        The browser's ``localStorage``.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = collections.Counter()
+        self.timers = []
+        self.delays = []
+        self.local_storage = LocalStorage()
+        self.dashboard = None
+        self.settings = None
+        self.server_functions = {}
+        self.app_tables = _AppTables()
+
+    def round_trip(self, name):
+        self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def set_timeout(self, fn, ms=0):
+        self.timers.append(fn)
+        self.delays.append(ms)
+        return len(self.timers)
+
+    def run_timers(self):
+        """Runs everything queued with ``setTimeout``, including newly queued work."""
+        while self.timers:
+            self.timers.pop(0)()
+
+    def reset_calls(self):
+        self.calls.clear()
+
+
+class EventTarget:
+    def __init__(self, host):
+        self._host = host
+        self._listeners = collections.defaultdict(list)
+
+    def addEventListener(self, event_type, listener):
+        self._listeners[event_type].append(listener)
+
+        def remove():
+            self._listeners[event_type].remove(listener)
+
+        return remove
+
+    def listener_count(self, event_type=None):
+        if event_type is None:
+            return sum(len(v) for v in self._listeners.values())
+        return len(self._listeners[event_type])
+
+    def fire(self, event_type, **attrs):
+        event = JSObject(_type=event_type, **attrs)
+        for listener in list(self._listeners[event_type]):
+            listener(event)
+        return event
+
+
+class Field(JSObject):
+    pass
+
+
+class Parameter(EventTarget):
+    def __init__(self, host, name, value, data_type="int", allowable=None, id=None):
+        super().__init__(host)
+        self.name = name
+        self.id = id or f"[Parameters].[{name}]"
+        self.dataType = data_type
+        self.currentValue = DataValue(value)
+        allowable = allowable or {"type": "all"}
+        self.allowableValues = JSObject(
+            type=allowable["type"],
+            allowableValues=[DataValue(v) for v in allowable.get("values", [])],
+            minValue=DataValue(allowable.get("min")),
+            maxValue=DataValue(allowable.get("max")),
+        )
+
+    def changeValueAsync(self, value):
+        self._host.round_trip("changeValueAsync")
+        self.currentValue = DataValue(from_native(value))
+        self.fire("parameter-changed", getParameterAsync=lambda: self)
+        return self.currentValue
+
+
+class CategoricalFilter(JSObject):
+    def __init__(self, host, worksheet, field_name, domain, applied=None):
+        super().__init__(
+            fieldName=field_name,
+            fieldId=f"[{field_name}]",
+            filterType="categorical",
+            worksheetName=worksheet.name,
+            isExcludeMode=False,
+        )
+        self._host = host
+        self.domain = list(domain)
+        self.set_applied(self.domain if applied is None else applied)
+
+    def set_applied(self, values):
+        values = list(values)
+        self.appliedValues = [DataValue(v) for v in values]
+        self.isAllSelected = set(values) == set(self.domain)
+
+    def getDomainAsync(self, domain_type="relevant"):
+        self._host.round_trip("getDomainAsync")
+        return JSObject(type=domain_type, values=[DataValue(v) for v in self.domain])
+
+    def getFieldAsync(self):
+        self._host.round_trip("getFieldAsync")
+        return Field(id=self.fieldId, name=self.fieldName)
+
+
+class RangeFilter(JSObject):
+    def __init__(self, host, worksheet, field_name, min, max):
+        super().__init__(
+            fieldName=field_name,
+            fieldId=f"[{field_name}]",
+            filterType="range",
+            worksheetName=worksheet.name,
+            includeNullValues=False,
+        )
+        self._host = host
+        self.domain = (min, max)
+        self.set_range(min, max)
+
+    def set_range(self, min, max):
+        self.minValue = DataValue(from_native(min))
+        self.maxValue = DataValue(from_native(max))
+
+    def getDomainAsync(self, domain_type="relevant"):
+        self._host.round_trip("getDomainAsync")
+        return JSObject(
+            type=domain_type,
+            min=DataValue(self.domain[0]),
+            max=DataValue(self.domain[1]),
+        )
+
+
+class Datasource(JSObject):
+    def __init__(self, host, name, tables, id=None, extract_update_time=None):
+        super().__init__(
+            name=name,
+            id=id or f"federated.{name.lower().replace(' ', '_')}",
+            isExtract=extract_update_time is not None,
+            extractUpdateTime=extract_update_time,
+        )
+        self._host = host
+        self.tables = dict(tables)
+        self.fields = [
+            Field(id=c.fieldId, name=c.fieldName, dataSource=self)
+            for table in self.tables.values()
+            for c in table.columns
+        ]
+
+    def getLogicalTablesAsync(self):
+        self._host.round_trip("getLogicalTablesAsync")
+        return [JSObject(id=k, caption=k.split("_")[0]) for k in self.tables]
+
+    def getLogicalTableDataAsync(self, table_id, options=None):
+        self._host.round_trip("getLogicalTableDataAsync")
+        return self.tables[table_id].sliced(options)
+
+    def getLogicalTableDataReaderAsync(self, table_id, page_row_count, options=None):
+        self._host.round_trip("getLogicalTableDataReaderAsync")
+        table = self.tables[table_id].sliced(options)
+        return DataTableReader(self._host, table, page_row_count)
+
+    def refreshAsync(self):
+        self._host.round_trip("refreshAsync")
+
+
+def _as_list(tables):
+    """Marks can span several logical tables: ``selected`` may be a list of them."""
+    return list(tables) if isinstance(tables, list) else [tables]
+
+
+class Worksheet(EventTarget):
+    def __init__(self, host, name, summary=None, underlying=None, datasources=()):
+        super().__init__(host)
+        self.name = name
+        self.summary = summary if summary is not None else DataTable([], [])
+        self.underlying = dict(underlying or {})
+        self.datasources = list(datasources)
+        self.filters = {}
+        self.selected = DataTable([], [])
+        self.highlighted = DataTable([], [])
+        self.selection_calls = []
+
+    def add_categorical_filter(self, field_name, domain, applied=None):
+        f = CategoricalFilter(self._host, self, field_name, domain, applied)
+        self.filters[field_name] = f
+        return f
+
+    def add_range_filter(self, field_name, min, max):
+        f = RangeFilter(self._host, self, field_name, min, max)
+        self.filters[field_name] = f
+        return f
+
+    def getSummaryDataAsync(self, options=None):
+        self._host.round_trip("getSummaryDataAsync")
+        return self.summary.sliced(options)
+
+    def getSummaryColumnsInfoAsync(self):
+        self._host.round_trip("getSummaryColumnsInfoAsync")
+        return list(self.summary.columns)
+
+    def getUnderlyingTablesAsync(self):
+        self._host.round_trip("getUnderlyingTablesAsync")
+        return [JSObject(id=k, caption=k.split("_")[0]) for k in self.underlying]
+
+    def getUnderlyingTableDataAsync(self, table_id, options=None):
+        self._host.round_trip("getUnderlyingTableDataAsync")
+        return self.underlying[table_id].sliced(options)
+
+    def getUnderlyingTableDataReaderAsync(self, table_id, page_row_count, options=None):
+        self._host.round_trip("getUnderlyingTableDataReaderAsync")
+        table = self.underlying[table_id].sliced(options)
+        return DataTableReader(self._host, table, page_row_count)
+
+    def getSummaryDataReaderAsync(self, page_row_count, options=None):
+        self._host.round_trip("getSummaryDataReaderAsync")
+        table = self.summary.sliced(options)
+        return DataTableReader(self._host, table, page_row_count)
+
+    def getSelectedMarksAsync(self):
+        self._host.round_trip("getSelectedMarksAsync")
+        return JSObject(data=_as_list(self.selected))
+
+    def getHighlightedMarksAsync(self):
+        self._host.round_trip("getHighlightedMarksAsync")
+        return JSObject(data=_as_list(self.highlighted))
+
+    def selectMarksByValueAsync(self, selection, selection_type):
+        self._host.round_trip("selectMarksByValueAsync")
+        self.selection_calls.append((selection, selection_type))
+
+    def clearSelectedMarksAsync(self):
+        self._host.round_trip("clearSelectedMarksAsync")
+
+    def getFiltersAsync(self):
+        self._host.round_trip("getFiltersAsync")
+        return list(self.filters.values())
+
+    def applyFilterAsync(self, field_name, values, update_type):
+        self._host.round_trip("applyFilterAsync")
+        f = self.filters.get(field_name)
+        if f is None:
+            f = self.add_categorical_filter(field_name, values, [])
+        current = [from_native(v.nativeValue) for v in f.appliedValues]
+        values = [from_native(v) for v in values]
+        if update_type == "add":
+            values = current + [v for v in values if v not in set(current)]
+        elif update_type == "remove":
+            values = [v for v in current if v not in set(values)]
+        f.set_applied(values)
+        self.fire("filter-changed", fieldName=field_name, _worksheet=self)
+        return field_name
+
+    def applyRangeFilterAsync(self, field_name, options):
+        self._host.round_trip("applyRangeFilterAsync")
+        self.filters[field_name].set_range(options["min"], options["max"])
+        self.fire("filter-changed", fieldName=field_name, _worksheet=self)
+        return field_name
+
+    def clearFilterAsync(self, field_name):
+        self._host.round_trip("clearFilterAsync")
+        f = self.filters[field_name]
+        if f.filterType == "categorical":
+            f.set_applied(f.domain)
+        else:
+            f.set_range(*f.domain)
+        self.fire("filter-changed", fieldName=field_name, _worksheet=self)
+        return field_name
+
+    def getParametersAsync(self):
+        self._host.round_trip("getParametersAsync")
+        return list(self._host.dashboard.parameters.values())
+
+    def findParameterAsync(self, name):
+        self._host.round_trip("findParameterAsync")
+        return self._host.dashboard.parameters.get(name)
+
+    def getDataSourcesAsync(self):
+        self._host.round_trip("getDataSourcesAsync")
+        return list(self.datasources)
+
+
+class Dashboard(JSObject):
+    def __init__(self, host, name="Dashboard"):
+        super().__init__(name=name, id=1)
+        self._host = host
+        self.worksheets = []
+        self.parameters = {}
+
+    def add_worksheet(self, name, **kwargs):
+        ws = Worksheet(self._host, name, **kwargs)
+        self.worksheets.append(ws)
+        return ws
+
+    def add_parameter(self, name, value, data_type="int", allowable=None):
+        p = Parameter(self._host, name, value, data_type, allowable)
+        self.parameters[name] = p
+        return p
+
+    def getParametersAsync(self):
+        self._host.round_trip("getParametersAsync")
+        return list(self.parameters.values())
+
+    def findParameterAsync(self, name):
+        self._host.round_trip("findParameterAsync")
+        return self.parameters.get(name)
+
+
+class Settings(JSObject):
+    def __init__(self, host):
+        super().__init__()
+        self._host = host
+        self._values = {}
+
+    def get(self, key):
+        return self._values.get(key)
+
+    def set(self, key, value):
+        self._values[key] = value
+
+    def erase(self, key):
+        self._values.pop(key, None)
+
+    def getAll(self):
+        return dict(self._values)
+
+    def saveAsync(self):
+        self._host.round_trip("saveAsync")
+
+
+def _identity_decorator(*args, **kwargs):
+    return lambda fn: fn
+
+
+def install(latency=0.0):
+    """Installs the fake ``anvil`` modules and returns the :class:`Host`.
+
+    Also makes the library importable as ``trexjacket``, and gives the modules in
+    ``server_code`` in-memory Data Tables (``host.app_tables``). Calling ``install``
+    again starts a fresh host and session.
+    """
+    host = Host(latency)
+    host.dashboard = Dashboard(host)
+    host.settings = Settings(host)
+
+    extensions = JSObject(
+        dashboardContent=JSObject(dashboard=host.dashboard),
+        settings=host.settings,
+        environment=JSObject(mode="authoring", apiVersion="1.9.0"),
+        ui=JSObject(),
+    )
+    window = JSObject(
+        Date=JSDate,
+        Blob=Blob,
+        setTimeout=host.set_timeout,
+        localStorage=host.local_storage,
+        Function=lambda *source: lambda fns: [fn() for fn in fns],
+    )
+
+    def call_server(name, *args, **kwargs):
+        host.round_trip(f"server:{name}")
+        return host.server_functions[name](*args, **kwargs)
+
+    anvil = types.ModuleType("anvil")
+    anvil.__path__ = []
+    anvil_js = types.ModuleType("anvil.js")
+    anvil_js.window = window
+    anvil_js.report_exceptions = lambda fn: fn
+    anvil_js.call_js = lambda *args: None
+    anvil_js.await_promise = lambda promise: promise
+    anvil_js.to_media = Media
+    anvil_tableau = types.ModuleType("anvil.tableau")
+    anvil_tableau.extensions = extensions
+    anvil_server = types.ModuleType("anvil.server")
+    anvil_server.call = call_server
+    anvil_server.get_app_origin = lambda: "http://localhost"
+    anvil_server.callable = lambda fn: fn
+    anvil_server.session = {}
+    anvil_tables = types.ModuleType("anvil.tables")
+    anvil_tables.__path__ = []
+    anvil_tables.app_tables = host.app_tables
+    anvil_query = types.ModuleType("anvil.tables.query")
+    anvil_query.less_than = _LessThan
+    anvil_tables.query = anvil_query
+    hints = types.ModuleType("anvil.code_completion_hints")
+    hints.EventHandler = lambda **kwargs: None
+    hints.function_type_hint = JSObject(event_handler_enum=_identity_decorator)
+
+    anvil.js, anvil.tableau, anvil.server = anvil_js, anvil_tableau, anvil_server
+    anvil.tables = anvil_tables
+    anvil.BlobMedia = BlobMedia
+    anvil.code_completion_hints = hints
+    modules = (anvil, anvil_js, anvil_tableau, anvil_server, anvil_tables, anvil_query)
+    for module in modules + (hints,):
+        sys.modules[module.__name__] = module
+
+    stale = ("trexjacket", "server_code")
+    for name in [m for m in sys.modules if m.split(".")[0] in stale]:
+        del sys.modules[name]
+    package = types.ModuleType("trexjacket")
+    package.__path__ = [CLIENT_CODE]
+    sys.modules["trexjacket"] = package
+    return host
@@ -0,0 +1,87 @@
+"""Synthetic data for the fake Tableau host.
+
+All generators are deterministic for a given ``seed``.
+"""
+import datetime as dt
+import random
+
+from .mock_tableau import DataTable
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+REGIONS = ["Central", "East", "South", "West"]
+CATEGORIES = ["Furniture", "Office Supplies", "Technology"]
+
+
+def customer_names(n):
+    """``n`` distinct, human-looking customer names."""
+    first = ["Ann", "Bob", "Cara", "Dev", "Eli", "Fay", "Gus", "Hal", "Ida", "Jo"]
+    return [f"{first[i % len(first)]} {i:07d}" for i in range(n)]
+
+
+def make_table(rows, measures=2, seed=0, name="Orders"):
+    """A summary-style table: dimensions, an order date and ``measures`` floats.
+
+    Columns are ``Order ID``, ``Customer Name``, ``Region``, ``Category``,
+    ``Order Date``, ``Quantity`` and ``SUM(Measure i)`` for each measure.
+    """
+    rng = random.Random(seed)
+    start = dt.date(2020, 1, 1)
+    columns = [
+        ("Order ID", "string"),
+        ("Customer Name", "string"),
+        ("Region", "string"),
+        ("Category", "string"),
+        ("Order Date", "date"),
+        ("Quantity", "int"),
+    ] + [(f"SUM(Measure {i})", "float") for i in range(measures)]
+    data = [
+        [
+            f"ORD-{i:07d}",
+            f"Customer {i % 5000:04d}",
+            REGIONS[i % len(REGIONS)],
+            CATEGORIES[i % len(CATEGORIES)],
+            start + dt.timedelta(days=i % 1000),
+            rng.randint(1, 20),
+        ]
+        + [round(rng.uniform(0, 1000), 2) for _ in range(measures)]
+        for i in range(rows)
+    ]
+    return DataTable(columns, data, name=name, is_summary=True)
+
+
+def make_measure_names_table(rows, measures=3, seed=0):
+    """A long-format table using ``Measure Names`` / ``Measure Values``.
+
+    ``rows`` is the number of rows after collapsing, so the table itself holds
+    ``rows * measures`` rows.
+    """
+    rng = random.Random(seed)
+    columns = [
+        ("Customer Name", "string"),
+        ("Region", "string"),
+        ("Measure Names", "string"),
+        ("Measure Values", "float"),
+    ]
+    data = []
+    for i in range(rows):
+        for m in range(measures):
+            data.append(
+                [
+                    f"Customer {i:07d}",
+                    REGIONS[i % len(REGIONS)],
+                    f"[Measure {m}]",
+                    round(rng.uniform(0, 1000), 2),
+                ]
+            )
+    table = DataTable(columns, data, is_summary=True)
+    for row in table.data:
+        row[2].formattedValue = f"SUM(Measure {row[2].value[9:-1]})"
+    return table
+
+
+def make_domain(n, seed=0):
+    """A shuffled list of ``n`` distinct customer names."""
+    values = customer_names(n)
+    random.Random(seed).shuffle(values)
+    return values
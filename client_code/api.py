@@ -38,10 +38,20 @@ def get_environment():
     return {attr: env.get(attr) for attr in attrs}
 
 
-def get_dashboard():
+def get_dashboard(preload=False):
     """Gets the instance of Tableau Dashboard that represents the current connection. This is
     the recommended entry point to the Tableau Extensions API.
 
+    Worksheets, parameters and datasources are fetched from Tableau on first use, so
+    this call is cheap.
+
+    Parameters
+    ----------
+    preload : bool
+        Whether to fetch the worksheets, parameters and datasources in the background
+        (and concurrently) as soon as the current code yields, e.g. once the start-up
+        form has been shown.
+
     Returns
     -------
 
@@ -54,4 +64,7 @@ def get_dashboard():
     >>> from trexjacket import api
     >>> mydashboard = api.get_dashboard()
     """
-    return _Tableau.session().dashboard
+    dashboard = _Tableau.session().dashboard
+    if preload:
+        dashboard.preload()
+    return dashboard
@@ -1,5 +1,3 @@
-import time
-
 import anvil
 import anvil.server
 import anvil.tableau
@@ -7,10 +5,6 @@ import anvil.tableau
 from .._utils import _dejsonify, _jsonify
 from ._registration import _forms, dialog_form
 
-# Import standard_alert and standard_confirm so they are registered
-from ._standard_alert import _standard_alert
-from ._standard_confirm import _standard_confirm
-
 
 class DialogAlreadyOpenError(Exception):
     pass
@@ -190,6 +184,18 @@ def confirm(text, width=None, height=None, large=False):
     return show_form("_standard_confirm", width=width, height=height, text=text)
 
 
+def _register_standard_dialog(form_name):
+    """Imports, and so registers, ``form_name`` if it is one of the standard dialogs.
+
+    These are only ever shown inside a dialog window, so they are not imported with
+    this module.
+    """
+    if form_name == "_standard_alert":
+        from ._standard_alert import _standard_alert  # noqa: F401
+    elif form_name == "_standard_confirm":
+        from ._standard_confirm import _standard_confirm  # noqa: F401
+
+
 def _return_payload(value=None, **event_args):
     return_value = _jsonify(value)
     anvil.tableau.extensions.ui.closeDialog(return_value)
@@ -201,6 +207,7 @@ def _launch_dialog(show_dialog_form):
     dialog_args = startup_data[0]
     dialog_kwargs = startup_data[1]
 
+    _register_standard_dialog(show_dialog_form)
     if show_dialog_form in _forms:
         try:
             anvil.open_form(_forms[show_dialog_form](*dialog_args, **dialog_kwargs))
@@ -4,3 +4,11 @@ class MultipleTablesException(Exception):
     """
 
     pass
+
+
+class EventCancelled(Exception):
+    """Raised when work for an event is abandoned because a newer event of the same
+    kind has superseded it. See :obj:`~client_code.model.scheduling.CancellationToken`.
+    """
+
+    pass
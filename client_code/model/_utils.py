@@ -4,6 +4,44 @@ from operator import itemgetter
 
 import anvil.js
 
+_js_gather = None
+
+
+def _gather(fns):
+    """Calls each of the functions in ``fns`` concurrently and returns their results.
+
+    Each call runs until it blocks (e.g. on a Tableau or server round trip), which lets
+    the next one start, so the round trips overlap rather than queue. The first
+    exception raised by any of the calls is re-raised once they have all finished.
+    """
+    global _js_gather
+    if _js_gather is None:
+        _js_gather = anvil.js.window.Function(
+            "fns", "return Promise.all(fns.map(function (fn) { return fn(); }));"
+        )
+
+    results = [None] * len(fns)
+    errors = []
+
+    def runner(i, fn):
+        def run():
+            try:
+                results[i] = fn()
+            except Exception as err:
+                errors.append(err)
+
+        return run
+
+    _js_gather([runner(i, fn) for i, fn in enumerate(fns)])
+    if errors:
+        raise errors[0]
+    return results
+
+
+def _call_soon(fn):
+    """Calls ``fn`` in the background, once the current code yields to the browser."""
+    anvil.js.window.setTimeout(anvil.js.report_exceptions(fn), 0)
+
 
 def cleanup_measures(records):
     """Cleans up a list of dicts. Returns a list of dicts"""
@@ -81,6 +119,28 @@ def native_value_date_handler(native_value):
         return datetime_obj
 
 
+def _float_value(data_value):
+    try:
+        return float(data_value.nativeValue)
+    except ValueError:
+        print(
+            "Warning, float conversion failed. Returning the formatted value of the parameter."
+        )
+        return data_value.formattedValue
+
+
+def data_value_converter(data_type):
+    """Returns the function that converts a DataValue of the given Tableau data type
+    into a Python value, so that the type only needs checking once per batch of values.
+    """
+    if data_type in ("date", "date-time"):
+        return lambda data_value: native_value_date_handler(data_value.nativeValue)
+    elif data_type == "float":
+        return _float_value
+    else:
+        return lambda data_value: data_value.nativeValue
+
+
 def _to_js_date(input_date):
     """Converts a python date to a UTC js date."""
     if type(input_date) is datetime.date:
@@ -103,3 +163,31 @@ def _to_js_date(input_date):
         )
     else:
         return input_date
+
+
+def _selection_criteria(dimension):
+    """Builds the SelectionCriteria for a dict, or list of dicts, of field values.
+
+    The values given for a field are grouped into one criterion. A value can be a single
+    value, a list of values, or a dict with 'min' and/or 'max' keys for a range.
+    """
+    if not isinstance(dimension, list):
+        dimension = [dimension]
+
+    categorical = {}
+    ranges = {}
+    for d in dimension:
+        for field, value in d.items():
+            if isinstance(value, dict):
+                ranges[field] = {k: _to_js_date(v) for k, v in value.items()}
+                continue
+            if not isinstance(value, (list, tuple, set)):
+                value = [value]
+            # A dict keeps the values in order while dropping duplicates
+            values = categorical.setdefault(field, {})
+            for v in value:
+                values[v] = None
+
+    criteria = [{"fieldName": k, "value": list(v)} for k, v in categorical.items()]
+    criteria.extend({"fieldName": k, "value": v} for k, v in ranges.items())
+    return criteria
@@ -0,0 +1,77 @@
+try:
+    from array import array
+except ImportError:
+    # Not every Python runtime in the browser provides the array module.
+    array = None
+
+# The array typecodes for Tableau's numeric data types.
+TYPECODES = {"int": "q", "float": "d"}
+
+
+def _pack(typecode, values):
+    """``values`` in a typed array, or in a list where that isn't possible."""
+    if array is not None:
+        try:
+            return array(typecode, values)
+        except (ValueError, TypeError, OverflowError):
+            pass
+    return list(values)
+
+
+class NumericColumn:
+    """The values of an int or float column, packed into a typed buffer.
+
+    ``data`` is an :obj:`array.array` (typecode ``q`` for ints, ``d`` for floats),
+    which supports the buffer protocol, e.g. ``memoryview(column.data)``. Nulls are
+    stored as 0 in ``data``, and marked in the ``nulls`` bitmap, which is None when
+    the column has none. Indexing or iterating over the column gives None for nulls,
+    and slicing it gives a list.
+
+    Where typed arrays are unavailable, or a value doesn't fit, ``data`` is a list.
+    Server calls take neither arrays nor bytes, so pass ``column.to_list()`` to send
+    a column to server code.
+
+    Usually created with :obj:`~client_code.model.proxies.DataTable.get_columns`.
+    """
+
+    __slots__ = ("name", "data_type", "data", "nulls")
+
+    def __init__(self, name, data_type, values):
+        self.name = name
+        self.data_type = data_type
+        zero = 0.0 if data_type == "float" else 0
+        nulls = None
+        packed = []
+        for i, value in enumerate(values):
+            if value is None:
+                if nulls is None:
+                    nulls = bytearray((len(values) + 7) // 8)
+                nulls[i >> 3] |= 1 << (i & 7)
+                value = zero
+            packed.append(value)
+        self.data = _pack(TYPECODES[data_type], packed)
+        self.nulls = nulls
+
+    def is_null(self, i):
+        return self.nulls is not None and bool(self.nulls[i >> 3] & (1 << (i & 7)))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self.data)))]
+        if i < 0:
+            i += len(self.data)
+        return None if self.is_null(i) else self.data[i]
+
+    def __iter__(self):
+        if self.nulls is None:
+            return iter(self.data)
+        return (None if self.is_null(i) else v for i, v in enumerate(self.data))
+
+    def to_list(self):
+        return list(self)
+
+    def __repr__(self):
+        return f"NumericColumn({self.name!r}, {self.data_type!r}, {len(self)} values)"
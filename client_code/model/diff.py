@@ -0,0 +1,98 @@
+import re
+
+# Tableau names aggregated measures in summary data like "SUM(Sales)" or
+# "AGG(Profit Ratio)", and date parts of a dimension the same way, e.g.
+# "YEAR(Order Date)".
+_FUNCTION = re.compile(r"^([A-Z]+)\(.*\)$")
+
+_DATE_PARTS = {
+    "YEAR",
+    "QUARTER",
+    "MONTH",
+    "WEEK",
+    "WEEKDAY",
+    "DAY",
+    "HOUR",
+    "MINUTE",
+    "SECOND",
+    "MDY",
+    "MY",
+    "QY",
+}
+
+
+def is_measure_column(name):
+    """Whether a summary data column holds a measure rather than a dimension.
+
+    Summary data columns don't say which role their field has, so this goes by the
+    column name: "Measure Values" and names like ``SUM(Sales)`` are measures, except
+    for the date parts of a dimension, such as ``YEAR(Order Date)`` or
+    ``MDY(Order Date)``.
+    """
+    if name == "Measure Values":
+        return True
+    match = _FUNCTION.match(name)
+    return match is not None and match.group(1) not in _DATE_PARTS
+
+
+def key_columns_of(record):
+    """The dimension columns of ``record``, which identify its row in summary data."""
+    return [name for name in record if not is_measure_column(name)]
+
+
+class SummarySnapshot:
+    """The rows of a table, indexed by their key columns, for diffing against the next
+    version of the table.
+
+    Rows whose key columns are equal (e.g. when the table has no dimensions) are told
+    apart by the order in which they appear.
+
+    Parameters
+    ----------
+    key_columns : list
+        The names of the columns that identify a row. If None, every column that
+        isn't a measure is used.
+    """
+
+    def __init__(self, key_columns=None):
+        self.key_columns = key_columns
+        self.rows = {}
+
+    def _keys(self, records):
+        """Yields a (key, record) pair for each record."""
+        columns = self.key_columns
+        if columns is None and records:
+            columns = self.key_columns = key_columns_of(records[0])
+        seen = {}
+        for record in records:
+            key = tuple(record.get(column) for column in columns)
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            yield (key, count), record
+
+    def update(self, records):
+        """Replaces the snapshot with ``records`` and returns the changes.
+
+        Returns
+        -------
+        :obj:`dict` with keys ``inserted`` and ``updated``, holding the new records,
+        and ``deleted``, holding the records that are no longer present.
+        """
+        previous = self.rows
+        rows = {}
+        inserted = []
+        updated = []
+        for key, record in self._keys(records):
+            rows[key] = record
+            old = previous.pop(key, None)
+            if old is None:
+                inserted.append(record)
+            elif old != record:
+                updated.append(record)
+
+        self.rows = rows
+        return {
+            "inserted": inserted,
+            "deleted": list(previous.values()),
+            "updated": updated,
+        }
@@ -0,0 +1,93 @@
+import datetime
+
+import anvil.js
+
+from ._utils import clean_record_key, native_value_date_handler
+
+# Rows per page requested from Tableau when streaming a table.
+PAGE_SIZE = 10000
+
+_QUOTED = (",", '"', "\n", "\r")
+
+
+def _csv_field(value):
+    """Formats a value as a CSV field, quoting it where needed."""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    text = str(value)
+    if any(char in text for char in _QUOTED):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def iter_pages(reader):
+    """Yields each page of a Tableau DataTableReader, and releases it at the end."""
+    try:
+        for page_number in range(reader.pageCount):
+            yield reader.getPageAsync(page_number)
+    finally:
+        reader.releaseAsync()
+
+
+def _header(columns):
+    return ",".join(_csv_field(clean_record_key(c.fieldName)) for c in columns)
+
+
+def csv_chunks(pages, formatted=False, header=True, column_info=None):
+    """Yields a CSV document, one chunk of text per page of a table.
+
+    Parameters
+    ----------
+    pages : iterable
+        The Tableau DataTables holding the pages.
+    formatted : bool
+        Whether to write the values as Tableau formats them, rather than their native
+        values.
+    header : bool
+        Whether the first chunk starts with a row of column names.
+    column_info : function
+        Returns the Tableau columns of the table. Used for the header of a table
+        without any pages, which has no columns to read it from.
+    """
+    converters = None
+    for page in pages:
+        lines = []
+        if converters is None:
+            columns = page.columns
+            converters = [_converter(c, formatted) for c in columns]
+            if header:
+                lines.append(_header(columns))
+        for row in page.data:
+            lines.append(
+                ",".join(
+                    _csv_field(convert(data_value))
+                    for convert, data_value in zip(converters, row)
+                )
+            )
+        if lines:
+            yield "\r\n".join(lines) + "\r\n"
+    if converters is None and header and column_info is not None:
+        yield _header(column_info()) + "\r\n"
+
+
+def _converter(column, formatted):
+    """The function reading a column's value from a DataValue, as for records."""
+    if formatted or column.fieldName == "Measure Names":
+        return lambda data_value: data_value.formattedValue
+    if column.dataType in ("date", "date-time"):
+        return lambda data_value: native_value_date_handler(data_value.nativeValue)
+    return lambda data_value: data_value.nativeValue
+
+
+def to_media(chunks, name="export.csv", content_type="text/csv"):
+    """Builds a Media object from chunks of text.
+
+    Each chunk is handed to the browser as a Blob as soon as it is made, so the text
+    is never held in full by Python.
+    """
+    window = anvil.js.window
+    parts = [window.Blob([chunk]) for chunk in chunks]
+    blob = window.Blob(parts, {"type": content_type})
+    return anvil.js.to_media(blob, content_type=content_type, name=name)
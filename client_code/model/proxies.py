@@ -1,5 +1,4 @@
 import datetime as dt
-import itertools
 
 import anvil
 from anvil import tableau
@@ -8,18 +7,32 @@ from anvil.js import report_exceptions
 
 from .. import exceptions
 from .._utils import _dejsonify, _jsonify
-from . import events
+from . import events, scheduling
 from ._utils import (
+    _call_soon,
     _clean_columns,
+    _gather,
+    _selection_criteria,
     _to_js_date,
     clean_record_key,
     cleanup_measures,
+    data_value_converter,
     native_value_date_handler,
 )
 
-_event_cache = {}
+# The wrapper for each Tableau object seen during the session, keyed on
+# (wrapper class, identifier). See TableauProxy._wrap.
+_identity_map = {}
 
-import json
+# Categorical filter values are sent to Tableau in chunks of at most this many values.
+_FILTER_CHUNK_SIZE = 5000
+
+# Cancellation tokens are checked every this many rows while converting data.
+_CANCEL_CHECK_ROWS = 1000
+
+# When choosing between sending the changes to a filter's values and replacing them,
+# the cost of an extra call to Tableau, in values.
+_FILTER_CALL_COST = 50
 
 
 def _suppress_duplicate_events(event_handler):
@@ -27,7 +40,11 @@ def _suppress_duplicate_events(event_handler):
 
     Filter change events are often duplicated. This function is used within the
     registration of an event handler to replace the function from the user with one
-    that will only fire once for any given event.
+    that will only fire once for any given event. Each wrapped handler keeps its own
+    cache, so one handler seeing an event doesn't hide it from another. The session
+    wraps a handler once per event type and shares the wrapper across targets, so a
+    handler registered on several worksheets is called once for a filter change that
+    each of them reports.
 
     Parameters
     ----------
@@ -39,6 +56,8 @@ def _suppress_duplicate_events(event_handler):
     function
     """
 
+    _event_cache = {}
+
     def suppressing_handler(event):
         """An event handler that caches events and calls the original handler only if
         the event does not exist in the cache
@@ -59,6 +78,62 @@ def _suppress_duplicate_events(event_handler):
     return suppressing_handler
 
 
+# The values of includeDataValuesOption that records can be built from.
+_DATA_VALUES_OPTIONS = (None, "all-values", "only-native-values")
+
+
+def _data_options(
+    column_info,
+    columns=None,
+    max_rows=None,
+    ignore_aliases=False,
+    include_data_values=None,
+):
+    """The options for a ``get...DataAsync`` call, given those of our wrappers.
+
+    ``column_info()`` returns the Tableau columns of the table, and is used to look
+    up the ids of ``columns``.
+    """
+    if include_data_values not in _DATA_VALUES_OPTIONS:
+        raise ValueError(
+            f"Unsupported include_data_values {include_data_values!r}. Records are "
+            "built from native values, so it must be 'all-values' or "
+            "'only-native-values'."
+        )
+    options = {}
+    if columns is not None:
+        ids = {}
+        for column in column_info():
+            ids[column.fieldName] = ids[
+                clean_record_key(column.fieldName)
+            ] = column.fieldId
+        missing = [name for name in columns if name not in ids]
+        if missing:
+            raise KeyError(
+                f"No columns named {', '.join(missing)}. "
+                f"Valid columns: {', '.join(ids)}"
+            )
+        options["columnsToIncludeById"] = [ids[name] for name in columns]
+    if max_rows:
+        options["maxRows"] = max_rows
+    if ignore_aliases:
+        options["ignoreAliases"] = True
+    if include_data_values is not None:
+        options["includeDataValuesOption"] = include_data_values
+    return options
+
+
+def _included_columns(column_info, columns=None):
+    """The Tableau columns in ``column_info`` that ``columns`` names, or all of them."""
+    if columns is None:
+        return list(column_info)
+    return [
+        c
+        for c in column_info
+        if c.fieldName in columns or clean_record_key(c.fieldName) in columns
+    ]
+
+
 class NoDefault:
     pass
 
@@ -67,23 +142,86 @@ class TableauProxy:
     """A base class for those requiring a Tableau proxy object.
 
     Allows for access of the underlying Tableau JS object using the ``_proxy`` attribute.
+
+    Wrappers for objects that Tableau identifies (worksheets, parameters, datasources,
+    fields and filters) are shared for the whole session: the same Tableau object
+    always comes back as the same Python object, and two wrappers compare equal
+    when they wrap the same Tableau object.
     """
 
+    __slots__ = ("_proxy", "id")
+
+    #: The attribute of the JS object that identifies it, if any.
+    identifier = None
+
     def __init__(self, proxy):
         self._proxy = proxy
+        self.id = self._identify(proxy)
+
+    @classmethod
+    def _identify(cls, proxy):
+        """Returns the value identifying the Tableau object, or None."""
+        if cls.identifier is None:
+            return None
         try:
-            self.id = getattr(proxy, self.identifier)
+            return getattr(proxy, cls.identifier)
         except AttributeError:
-            self.id = None
+            return None
+
+    @classmethod
+    def _wrap(cls, proxy):
+        """Returns the session's wrapper for the Tableau object ``proxy``.
+
+        The wrapper is created on first sight. After that, the existing wrapper is
+        returned and its ``_proxy`` is replaced with the (fresher) one passed in.
+        """
+        key = cls._identify(proxy)
+        if key is None:
+            return cls(proxy)
+        try:
+            wrapper = _identity_map[cls, key]
+        except KeyError:
+            wrapper = _identity_map[cls, key] = cls(proxy)
+        else:
+            wrapper._proxy = proxy
+        return wrapper
 
     def __getattr__(self, name):
+        if name == "_proxy":
+            raise AttributeError(name)
         return getattr(self._proxy, name)
 
     def __eq__(self, other):
-        self.id == other.id
+        if not isinstance(other, TableauProxy):
+            return NotImplemented
+        if self.id is None:
+            return self is other
+        return type(self) is type(other) and self.id == other.id
 
+    def __hash__(self):
+        if self.id is None:
+            return object.__hash__(self)
+        return hash((type(self), self.id))
+
+
+class _TableauEvent(TableauProxy):
+    """A base class for change events.
+
+    ``token`` is the event's :obj:`~client_code.model.scheduling.CancellationToken`
+    when the handler was registered with ``policy="latest"``, and None otherwise.
+    """
+
+    __slots__ = ("token",)
+
+    def __init__(self, proxy, token=None):
+        super().__init__(proxy)
+        self.token = token
+
+    def _with_token(self, token):
+        return type(self)(self._proxy, token)
 
-class MarksSelectedEvent(TableauProxy):
+
+class MarksSelectedEvent(_TableauEvent):
     """Triggered when a user selects a mark on the Tableau dashboard.
 
     .. note::
@@ -91,13 +229,15 @@ class MarksSelectedEvent(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/marksselectedevent.html>` and accessed through the ``MarksSelectedEvent`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ()
+
     @property
     def worksheet(self):
         """The Tableau worksheet associated with generating the Selection Event.
 
         :type: :obj:`Worksheet`
         """
-        return Worksheet(self._proxy._worksheet)
+        return Worksheet._wrap(self._proxy._worksheet)
 
     def get_selected_marks(self, collapse_measures=False):
         """The data for the marks which were selected.
@@ -115,10 +255,10 @@ class MarksSelectedEvent(TableauProxy):
         records : list
             Data for the currently selected marks
         """
-        return self.worksheet.get_selected_marks(collapse_measures)
+        return self.worksheet.get_selected_marks(collapse_measures, token=self.token)
 
 
-class FilterChangedEvent(TableauProxy):
+class FilterChangedEvent(_TableauEvent):
     """Triggered when a user changes a filter on a dashboard.
 
     .. note::
@@ -126,6 +266,8 @@ class FilterChangedEvent(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/filterchangedevent.html>` and accessed through the ``FilterChangedEvent`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ()
+
     def __hash__(self):
         return hash(self.fieldName)
 
@@ -147,10 +289,10 @@ class FilterChangedEvent(TableauProxy):
 
         :type: :obj:`Worksheet`
         """
-        return Worksheet(self._proxy._worksheet)
+        return Worksheet._wrap(self._proxy._worksheet)
 
 
-class ParameterChangedEvent(TableauProxy):
+class ParameterChangedEvent(_TableauEvent):
     """Triggered when a user changes a parameter on a dashboard.
 
     .. note::
@@ -158,13 +300,15 @@ class ParameterChangedEvent(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/parameterchangedevent.html>` and accessed through the ``ParameterChangedEvent`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ()
+
     @property
     def parameter(self):
         """The parameter that was changed.
 
         :type: :obj:`Parameter`
         """
-        return Parameter(self._proxy.getParameterAsync())
+        return Parameter._wrap(self._proxy.getParameterAsync())
 
 
 class Field(TableauProxy):
@@ -174,27 +318,37 @@ class Field(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/field.html>` and accessed through the ``_DataTable`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ()
+    identifier = "id"
+
     @property
     def datasource(self):
-        return Datasource(self._proxy.dataSource)
+        return Datasource._wrap(self._proxy.dataSource)
 
 
 class Filter(TableauProxy):
     """A base class to represent a filter in Tableau."""
 
+    __slots__ = ()
+
+    @classmethod
+    def _identify(cls, proxy):
+        """Filters are identified by their worksheet and field."""
+        return (proxy.worksheetName, proxy.fieldName)
+
     @classmethod
     def _create_filter(cls, js_filter):
         """
         Returns an instance of one of the subclasses based on the proxy object's type.
         """
         if js_filter.filterType == "categorical":
-            return CategoricalFilter(js_filter)
+            return CategoricalFilter._wrap(js_filter)
         elif js_filter.filterType == "hierarchical":
-            return HierarchicalFilter(js_filter)
+            return HierarchicalFilter._wrap(js_filter)
         elif js_filter.filterType == "range":
-            return RangeFilter(js_filter)
+            return RangeFilter._wrap(js_filter)
         elif js_filter.filterType == "relative-date":
-            return RelativeDateFilter(js_filter)
+            return RelativeDateFilter._wrap(js_filter)
         else:
             raise TypeError(
                 f"Filters of type {js_filter.filterType} are not supported."
@@ -230,7 +384,7 @@ class Filter(TableauProxy):
     @property
     def field(self):
         """The field that has the filter applied."""
-        return Field(self._proxy.getFieldAsync())
+        return Field._wrap(self._proxy.getFieldAsync())
 
     def clear(self):
         """This is helper method that clears a filter from it's parent worksheet."""
@@ -248,9 +402,16 @@ class Filter(TableauProxy):
 class CategoricalFilter(Filter):
     """Represents a categorical filter in Tableau."""
 
+    __slots__ = ()
+
     @property
     def applied_values(self):
-        """The currently applied values to the filter."""
+        """The currently applied values to the filter.
+
+        When set, only the difference from the currently applied values is sent to
+        Tableau (as an 'add' and/or 'remove' update), unless replacing the values
+        outright is cheaper.
+        """
         if self.parent_worksheet:
             self._proxy = self.parent_worksheet.get_filter(self.field_name)._proxy
 
@@ -261,7 +422,30 @@ class CategoricalFilter(Filter):
 
     @applied_values.setter
     def applied_values(self, values):
-        self.parent_worksheet.apply_categorical_filter(self.field_name, values)
+        worksheet = self.parent_worksheet
+        if not isinstance(values, list):
+            values = [values]
+        for update_type, update in self._updates_to(values):
+            worksheet._apply_categorical_values(self.field_name, update, update_type)
+
+    def _updates_to(self, values):
+        """The cheapest list of (update_type, values) that applies ``values``."""
+        self._proxy = self.parent_worksheet.get_filter(self.field_name)._proxy
+        if self.is_all_selected or self.is_exclude_mode:
+            return [("replace", values)]
+
+        current = [native_value_date_handler(v.nativeValue) for v in self.appliedValues]
+        current_set, new_set = set(current), set(values)
+        to_add = [v for v in dict.fromkeys(values) if v not in current_set]
+        to_remove = [v for v in current if v not in new_set]
+
+        updates = [("add", to_add)] if to_add else []
+        if to_remove:
+            updates.append(("remove", to_remove))
+        delta_cost = len(to_add) + len(to_remove) + _FILTER_CALL_COST * len(updates)
+        if delta_cost < len(values) + _FILTER_CALL_COST:
+            return updates
+        return [("replace", values)]
 
     @property
     def is_all_selected(self):
@@ -273,11 +457,49 @@ class CategoricalFilter(Filter):
         """Whether or not the filter is in exclude mode."""
         return self._proxy.isExcludeMode
 
-    def get_domain(self, domain_type="relevant"):
+    def get_domain(self, domain_type="relevant", fresh=False):
         """Returns the filter's domain.
 
         domain_type can either be 'database' or relevant'
+
+        Domains are cached for the session: 'relevant' domains until a filter changes,
+        and 'database' domains until a datasource is refreshed. Set ``fresh`` to True
+        to read the domain from Tableau regardless.
         """
+        domain = _Tableau.session().domains.get(
+            self, domain_type, self._fetch_domain, fresh
+        )
+        return {"type": domain["type"], "values": list(domain["values"])}
+
+    def get_searchable_domain(self, domain_type="relevant", ngrams=True):
+        """Returns a :obj:`~client_code.model.search.SearchableDomain` over the filter's
+        domain, e.g. for a type-ahead picker.
+
+        The index is built once and cached along with the domain.
+
+        Parameters
+        ----------
+        domain_type : str
+            Either 'database' or 'relevant'
+        ngrams : bool
+            Whether substring searches should use an n-gram index.
+
+        Example
+        -------
+        >>> customers = ws.get_filter('Customer Name').get_searchable_domain()
+        >>> customers.search('ann', page_size=20)['values']
+        """
+        from .search import SearchableDomain
+
+        domain = _Tableau.session().domains.get(self, domain_type, self._fetch_domain)
+        searchable = domain.get("searchable")
+        if searchable is None or searchable.ngrams != ngrams:
+            searchable = domain["searchable"] = SearchableDomain(
+                domain["values"], ngrams=ngrams
+            )
+        return searchable
+
+    def _fetch_domain(self, domain_type):
         raw_domain = self._proxy.getDomainAsync(domain_type)
         values = [
             native_value_date_handler(datavalue.nativeValue)
@@ -304,6 +526,8 @@ class HierarchicalFilter(Filter):
     their camel case names listed in the Tableau Documentation.
     """
 
+    __slots__ = ()
+
     def describe(self):
         """Returns a descriptive string about the filter."""
         return "Hierarchical Filter"
@@ -312,6 +536,8 @@ class HierarchicalFilter(Filter):
 class RangeFilter(Filter):
     """Represents a Range Filter in Tableau."""
 
+    __slots__ = ()
+
     @property
     def include_null_values(self):
         """Whether or not the range filter includes null values."""
@@ -351,11 +577,19 @@ class RangeFilter(Filter):
             min_value, max_value = value, self.max
         self.parent_worksheet.apply_range_filter(self.field_name, min_value, max_value)
 
-    def get_domain(self, domain_type="relevant"):
+    def get_domain(self, domain_type="relevant", fresh=False):
         """Returns the filter's domain.
 
         domain_type can either be 'database' or relevant'
+
+        Domains are cached in the same way as :obj:`CategoricalFilter.get_domain`.
         """
+        domain = _Tableau.session().domains.get(
+            self, domain_type, self._fetch_domain, fresh
+        )
+        return dict(domain)
+
+    def _fetch_domain(self, domain_type):
         raw_domain = self._proxy.getDomainAsync(domain_type)
         return {
             "min": native_value_date_handler(raw_domain["min"].nativeValue),
@@ -373,6 +607,8 @@ class RangeFilter(Filter):
 
 
 class RelativeDateFilter(Filter):
+    __slots__ = ()
+
     def describe(self):
         """Returns a descriptive string about the filter."""
         return f"""
@@ -382,8 +618,6 @@ class RelativeDateFilter(Filter):
 
 
 class Parameter(TableauProxy):
-    identifier = "id"
-
     """Represents a parameter in Tableau. Parameter values can be modified and read using this class.
 
     .. note::
@@ -391,6 +625,17 @@ class Parameter(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/parameter.html>` and accessed through the ``Parameter`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ("_allowable", "_searchable")
+    identifier = "id"
+
+    def __init__(self, proxy):
+        super().__init__(proxy)
+        self._clear_cache()
+
+    def _clear_cache(self):
+        self._allowable = None
+        self._searchable = None
+
     def __str__(self):
         return f"Parameter named '{self.name}'"
 
@@ -404,9 +649,13 @@ class Parameter(TableauProxy):
 
     @property
     def value(self):
-        """The current value of the parameter."""
-        self._refresh()
-        return native_value_date_handler(self._proxy.currentValue.nativeValue)
+        """The current value of the parameter.
+
+        This is read from the session's copy of the parameter values, which is kept up
+        to date by parameter-changed events. Use :obj:`Parameter.get_value` with
+        ``fresh=True`` to read the value from Tableau instead.
+        """
+        return self.get_value()
 
     @value.setter
     def value(self, new_value):
@@ -419,6 +668,17 @@ class Parameter(TableauProxy):
         """
         self.change_value(new_value)
 
+    def get_value(self, fresh=False):
+        """Returns the current value of the parameter.
+
+        Parameters
+        ----------
+        fresh : bool
+            Whether to read the value from Tableau rather than from the session's copy
+            of the parameter values.
+        """
+        return _Tableau.session().parameter_values.get(self, fresh)
+
     @property
     def data_type(self):
         """The type of data this parameter holds. One of (bool | date | date-time | float | int | spatial | string).
@@ -431,36 +691,44 @@ class Parameter(TableauProxy):
     def allowable_values(self):
         """Returns the allowable set of values this parameter can take.
 
+        The values are converted once and then cached until Tableau reports a change
+        to the parameter.
+
         Returns
         --------
         The allowable set of values this parameter can take.
         """
-        param_type = self._proxy.allowableValues.type  # All, List, or Range
-
-        def _retrieve_value(val):
-            """Retrieve the allowableValue field based on its data type.
-
-            Parameters
-            ------
-            val : DataValue
-
-            Returns
-            ------
-            Value parsed with either .formattedValue(), .nativeValue(), .value() depending on the
-            data type of the parameter.
-            """
-            if self.data_type in ["date", "date-time"]:
-                return native_value_date_handler(val.nativeValue)
-            elif self.data_type == "float":
-                try:
-                    return float(val.nativeValue)
-                except ValueError:
-                    print(
-                        "Warning, float conversion failed. Returning the formatted value of the parameter."
-                    )
-                    return val.formattedValue
-            else:
-                return val.nativeValue
+        if self._allowable is None:
+            _Tableau.session().parameter_values.watch()
+            self._allowable = self._read_allowable_values()
+        if isinstance(self._allowable, dict):
+            return dict(self._allowable)
+        return list(self._allowable)
+
+    @property
+    def searchable_values(self):
+        """A :obj:`~client_code.model.search.SearchableDomain` over the allowable values
+        of a list parameter, cached along with them.
+
+        Example
+        -------
+        >>> dashboard.get_parameter('Customer').searchable_values.search('ann')
+        """
+        from .search import SearchableDomain
+
+        values = self.allowable_values
+        if self._searchable is None:
+            if isinstance(values, dict):
+                raise ValueError(
+                    "searchable_values is only available for list parameters"
+                )
+            self._searchable = SearchableDomain(values)
+        return self._searchable
+
+    def _read_allowable_values(self):
+        allowable = self._proxy.allowableValues
+        param_type = allowable.type  # All, List, or Range
+        _retrieve_value = data_value_converter(self.data_type)
 
         def _allvalues():
             raise ValueError(
@@ -468,13 +736,11 @@ class Parameter(TableauProxy):
             )
 
         def _listvalues():
-            return [
-                _retrieve_value(d) for d in self._proxy.allowableValues.allowableValues
-            ]
+            return [_retrieve_value(d) for d in allowable.allowableValues]
 
         def _rangevalues():
-            mmin = self._proxy.allowableValues.minValue
-            mmax = self._proxy.allowableValues.maxValue
+            mmin = allowable.minValue
+            mmax = allowable.maxValue
 
             return {"min": _retrieve_value(mmin), "max": _retrieve_value(mmax)}
 
@@ -494,9 +760,10 @@ class Parameter(TableauProxy):
             The new value to assign to this parameter. Note: For changing Date
             parameters, UTC Date objects are expected.
         """
-        self._proxy.changeValueAsync(new_value)
+        data_value = self._proxy.changeValueAsync(new_value)
+        _Tableau.session().parameter_values.set(self, data_value)
 
-    def register_event_handler(self, handler):
+    def register_event_handler(self, handler, policy=None):
         """Register an event handler that will be called whenever the parameter is changed.
 
         Note that the handler must take a ParameterChangedEvent instance as an argument.
@@ -505,11 +772,11 @@ class Parameter(TableauProxy):
         ----------
         handler : function
             Function that is called whenever the parameter is changed.
+        policy : None or 'latest'
+            How to schedule the handler. See :obj:`Dashboard.register_event_handler`.
         """
         session = _Tableau.session()
-        self._listener = session.register_event_handler(
-            events.PARAMETER_CHANGED, handler, self
-        )
+        session.register_event_handler(events.PARAMETER_CHANGED, handler, self, policy)
 
     def unregister_event_handler(self, handler):
         session = _Tableau.session()
@@ -532,6 +799,14 @@ class DataTable(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/datatable.html>` and accessed through the ``_DataTable`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ("_keys", "_values", "_indexes")
+
+    def __init__(self, proxy):
+        super().__init__(proxy)
+        self._keys = None
+        self._values = {}
+        self._indexes = {}
+
     @property
     def columns(self) -> dict:
         """Returns details on the columns in the datatable. {colname: coltype}
@@ -547,41 +822,254 @@ class DataTable(TableauProxy):
         """
         return _clean_columns(self._proxy.columns)
 
-    def get_records(self, collapse_measures=False):
+    def _column_keys(self):
+        """{record key: (column index, whether to use formatted values, data type)}"""
+        if self._keys is None:
+            self._keys = {
+                clean_record_key(c.fieldName): (
+                    i,
+                    c.fieldName == "Measure Names",
+                    c.dataType,
+                )
+                for i, c in enumerate(self._proxy.columns)
+            }
+        return self._keys
+
+    def column(self, name):
+        """The values in one column of the table, as in the records from
+        :obj:`get_records`. Each column is only converted once.
+
+        Parameters
+        ----------
+        name : str
+            The name of the column, as used for the keys of the records.
+
+        Returns
+        -------
+        :obj:`list`
+
+        Raises
+        ------
+        KeyError
+            If the table has no such column.
+        """
+        values = self._values.get(name)
+        if values is not None:
+            return values
+
+        keys = self._column_keys()
+        if name not in keys:
+            raise KeyError(
+                f"No column named '{name}'. Valid columns: {', '.join(keys)}"
+            )
+        index, use_formatted, data_type = keys[name]
+        rows = self._proxy.data
+        if use_formatted:
+            values = [row[index].formattedValue for row in rows]
+        elif data_type in ("date", "date-time"):
+            values = [native_value_date_handler(row[index].nativeValue) for row in rows]
+        else:
+            values = [row[index].nativeValue for row in rows]
+        self._values[name] = values
+        return values
+
+    def get_columns(self, *names):
+        """The values of the table by column, rather than by row.
+
+        Int and float columns are packed into typed buffers, see
+        :obj:`~client_code.model.columns.NumericColumn`, and other columns are lists
+        as from :obj:`column`.
+
+        Parameters
+        ----------
+        names : str
+            The names of the columns to return. All of them by default.
+
+        Returns
+        -------
+        :obj:`dict` of column name to column
+
+        Raises
+        ------
+        KeyError
+            If the table has no such column.
+
+        Example
+        -------
+        >>> sales = table.get_columns("Sales")["Sales"]
+        >>> anvil.server.call("store_sales", sales.to_list())
+        """
+        from .columns import NumericColumn
+
+        keys = self._column_keys()
+        result = {}
+        for name in names or keys:
+            index, use_formatted, data_type = keys.get(name, (None, True, None))
+            if use_formatted or data_type not in ("int", "float"):
+                result[name] = self.column(name)
+                continue
+            numeric = self._values.get((name, data_type))
+            if numeric is None:
+                values = [row[index].nativeValue for row in self._proxy.data]
+                numeric = self._values[name, data_type] = NumericColumn(
+                    name, data_type, values
+                )
+            result[name] = numeric
+        return result
+
+    def query(self):
+        """Starts a :obj:`~client_code.model.query.Query` over the rows of the table.
+
+        Example
+        -------
+        >>> table.query().where("Region", "West").top(10, "Sales").records()
+        """
+        from .query import Query
+
+        return Query(self)
+
+    def index(self, *columns):
+        """Returns a hash index on ``columns``, for looking up rows by key.
+
+        The index is built on first use and kept with the table.
+
+        Parameters
+        ----------
+        columns : str
+            The names of the columns to index on.
+
+        Returns
+        -------
+        :obj:`~client_code.model.query.Index`
+
+        Example
+        -------
+        >>> people = table.index("Customer ID")
+        >>> people.lookup("CG-12520")
+        [{'Customer ID': 'CG-12520', 'Customer Name': 'Claire Gute', ...}]
+        """
+        if not columns:
+            raise ValueError("At least one column is needed for an index.")
+        index = self._indexes.get(columns)
+        if index is None:
+            from .query import Index
+
+            index = self._indexes[columns] = Index(self, columns)
+        return index
+
+    def _records_at(self, rows, columns=None):
+        """The records for the rows at the positions in ``rows``."""
+        names = columns or list(self._column_keys())
+        values = [self.column(c) for c in names]
+        return [{name: v[i] for name, v in zip(names, values)} for i in rows]
+
+    def get_records(self, collapse_measures=False, token=None, compact=False):
         """The records in the data table.
 
+        Parameters
+        ----------
+        collapse_measures : bool
+            Whether or not to try and collapse records that use measure names / measure
+            values.
+        token : :obj:`~client_code.model.scheduling.CancellationToken`
+            If given, the conversion stops with EventCancelled once it is cancelled.
+        compact : bool
+            Whether to return :obj:`~client_code.model.rows.Row` objects, which share
+            their keys and take much less memory, rather than dicts.
+
         :obj:`list` of :obj:`dict`
         """
-        keys = [c.fieldName for c in self._proxy.columns]
-        raw_records = [
-            {
-                clean_record_key(attr[0]): (
-                    attr[1] if attr[0] != "Measure Names" else attr[2]
-                )
-                for attr in zip(
-                    keys,
-                    [
-                        native_value_date_handler(data_value.nativeValue)
-                        for data_value in row
-                    ],
-                    [data_value.formattedValue for data_value in row],
-                )
-            }
-            for row in self._proxy.data
-        ]
+        if compact:
+            raw_records = list(self._iter_rows(token))
+        else:
+            raw_records = list(self._iter_records(token))
         if not raw_records:
             return raw_records
         if collapse_measures:
-            return cleanup_measures(raw_records)
+            records = cleanup_measures(raw_records)
+            if compact:
+                from .rows import compact as compact_records
+
+                return compact_records(records)
+            return records
 
         if "Measure Names" in raw_records[0].keys():
-            print(
-                "Note: 'Measure Names' was found in the keys for these records.\n"
-                "Set the collapse_measures argument to True in order to collapse these values.\n"
-                "Your selection will not be affected by setting the collapse_measures argument to True."
-            )
+            _measure_names_note()
         return raw_records
 
+    def _iter_records(self, token=None):
+        """Yields the records of the table, converting one row at a time."""
+        fields = [c.fieldName for c in self._proxy.columns]
+        keys = [clean_record_key(f) for f in fields]
+        # Measure names are more readable formatted
+        formatted = [f == "Measure Names" for f in fields]
+        columns = list(zip(keys, formatted))
+
+        for i, row in enumerate(self._proxy.data):
+            if token is not None and not i % _CANCEL_CHECK_ROWS:
+                token.raise_if_cancelled()
+            yield {
+                key: (
+                    data_value.formattedValue
+                    if use_formatted
+                    else native_value_date_handler(data_value.nativeValue)
+                )
+                for (key, use_formatted), data_value in zip(columns, row)
+            }
+
+    def _iter_rows(self, token=None):
+        """Yields the records of the table as rows sharing one schema."""
+        from .rows import Row, Schema
+
+        fields = [c.fieldName for c in self._proxy.columns]
+        # Where keys clash, the last column wins, as for the records.
+        positions = {clean_record_key(f): i for i, f in enumerate(fields)}
+        schema = Schema(positions)
+        columns = [(i, fields[i] == "Measure Names") for i in positions.values()]
+
+        for n, row in enumerate(self._proxy.data):
+            if token is not None and not n % _CANCEL_CHECK_ROWS:
+                token.raise_if_cancelled()
+            values = [
+                row[i].formattedValue
+                if use_formatted
+                else native_value_date_handler(row[i].nativeValue)
+                for i, use_formatted in columns
+            ]
+            yield Row(schema, tuple(values))
+
+    def get_rows(self, collapse_measures=False, token=None):
+        """The records in the data table, as compact rows.
+
+        Equivalent to ``get_records(collapse_measures, token, compact=True)``.
+
+        :obj:`list` of :obj:`~client_code.model.rows.Row`
+        """
+        return self.get_records(collapse_measures, token, compact=True)
+
+    def _record_keys(self, collapse_measures=False):
+        """The keys of the records from :obj:`get_records`, in order."""
+        keys = list(
+            dict.fromkeys(clean_record_key(c.fieldName) for c in self._proxy.columns)
+        )
+        if collapse_measures and "Measure Names" in keys:
+            # As produced by cleanup_measures
+            measures = dict.fromkeys(self.column("Measure Names"))
+            keys = [
+                k
+                for k in keys
+                if k not in measures and k not in ("Measure Names", "Measure Values")
+            ] + list(measures)
+        return keys
+
+
+def _measure_names_note():
+    print(
+        "Note: 'Measure Names' was found in the keys for these records.\n"
+        "Set the collapse_measures argument to True in order to collapse these values.\n"
+        "Your selection will not be affected by setting the collapse_measures argument to True."
+    )
+
 
 class Datasource(TableauProxy):
     """Represents a Tableau data source.
@@ -594,6 +1082,9 @@ class Datasource(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/datasource.html>` and accessed through the ``Datasource`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ()
+    identifier = "id"
+
     def __str__(self):
         return f"Datasource named '{self.name}'. Use the .underlying_table_info property to retrieve information about the underlying tables that make up the datasource."
 
@@ -603,7 +1094,7 @@ class Datasource(TableauProxy):
         contains more than one logical table, a MultipleTablesException error is raised.
         """
         try:
-            return self.get_underlying_table().columns
+            return _clean_columns(self._column_info(self._only_table_id()))
         except exceptions.MultipleTablesException:
             raise exceptions.MultipleTablesException(
                 "More than one logical table exists in the datasource so you need\n"
@@ -615,21 +1106,78 @@ class Datasource(TableauProxy):
                 f"{self.underlying_table_info}"
             )
 
-    def get_underlying_table(self, id=None) -> DataTable:
+    def get_underlying_table(
+        self,
+        id=None,
+        cache=False,
+        columns=None,
+        max_rows=None,
+        ignore_aliases=False,
+        include_data_values=None,
+    ) -> DataTable:
         """Returns the underlying DataTable from the datasource by id.
 
         Parameters
         ----------
         id (optional): The ID of the table to get
+        cache (optional): Whether to keep the table in browser storage, and read it from
+            there on later calls, including after the page is reloaded. A cached table
+            that may be out of date is still returned, while it is fetched again in the
+            background. See :obj:`~client_code.model.storage.TableCache`.
+        columns (optional): The names of the columns to fetch. All of them by default.
+        max_rows (optional): The maximum number of rows to fetch. All of them by default.
+        ignore_aliases (optional): Whether to fetch the values of the data rather than
+            their aliases.
+        include_data_values (optional): Which values Tableau sends for each cell:
+            'all-values' (the default) or 'only-native-values'. Records are built
+            from the native values, so 'only-formatted-values' isn't supported.
 
         Raises
         ------
-        ValueError if an id is not provided and there are more than 1 logical table in the datasource.
-        """
-        if id:
-            return DataTable(self.getLogicalTableDataAsync(id))
+        ValueError if an id is not provided and there are more than 1 logical table in the datasource,
+            or include_data_values isn't supported.
+        KeyError if one of the columns doesn't exist.
+        """
+        table_id = id or self._only_table_id()
+
+        def fetch(options):
+            if options:
+                return self.getLogicalTableDataAsync(table_id, options)
+            return self.getLogicalTableDataAsync(table_id)
+
+        options = _data_options(
+            lambda: self._column_info(table_id),
+            columns,
+            max_rows,
+            ignore_aliases,
+            include_data_values,
+        )
+        if cache:
+            tables = _Tableau.session().tables
+            return DataTable(
+                tables.get(
+                    self._proxy, table_id, lambda: fetch(options), options=options
+                )
+            )
+        return DataTable(fetch(options))
 
-        tables = self.getLogicalTablesAsync()
+    def _logical_tables(self):
+        return _Tableau.session().schemas.get(
+            ("logical_tables", self.id), self._proxy.getLogicalTablesAsync
+        )
+
+    def _column_info(self, table_id):
+        """The Tableau columns of a logical table, read from a single row."""
+        return _Tableau.session().schemas.get(
+            ("logical_columns", self.id, table_id),
+            lambda: self._proxy.getLogicalTableDataAsync(
+                table_id, {"maxRows": 1}
+            ).columns,
+        )
+
+    def _only_table_id(self):
+        """The id of the datasource's logical table, if it only has one."""
+        tables = self._logical_tables()
         if len(tables) > 1:
             raise exceptions.MultipleTablesException(
                 "More than one logical table exists in the datasource so you need to specify the underlying table\n"
@@ -638,17 +1186,123 @@ class Datasource(TableauProxy):
                 "(result of self.underlying_table_info listed below)\n"
                 f"{self.underlying_table_info}"
             )
-        table_id = tables[0].id
-        return DataTable(self.getLogicalTableDataAsync(table_id))
-
-    def get_underlying_data(self, id=None):
+        return tables[0].id
+
+    def get_underlying_data(
+        self,
+        id=None,
+        token=None,
+        cache=False,
+        columns=None,
+        max_rows=None,
+        ignore_aliases=False,
+        include_data_values=None,
+        compact=False,
+    ):
         """Return the underlying data as a list of dictionaries.
 
         Parameters
         ----------
         id (optional): The ID of the table to get. This is requried if there are more than one underlying logical tables.
+        token (optional): A CancellationToken that stops the conversion once cancelled.
+        cache (optional): Whether to cache the table in browser storage. See :obj:`get_underlying_table`.
+        columns (optional): The names of the columns to fetch. All of them by default.
+        max_rows (optional): The maximum number of rows to fetch. All of them by default.
+        ignore_aliases (optional): Whether to fetch the values of the data rather than their aliases.
+        include_data_values (optional): Which values Tableau sends for each cell. See :obj:`get_underlying_table`.
+        compact (optional): Whether to return compact rows rather than dicts. See :obj:`DataTable.get_records`.
+        """
+        table = self.get_underlying_table(
+            id, cache, columns, max_rows, ignore_aliases, include_data_values
+        )
+        return table.get_records(token=token, compact=compact)
+
+    def export_csv(
+        self,
+        id=None,
+        columns=None,
+        formatted=False,
+        name=None,
+        page_size=None,
+    ):
+        """Exports a logical table of the datasource as a CSV file.
+
+        The table is read from Tableau a page at a time, and each page is written
+        out before the next is read, so memory use doesn't grow with the table.
+
+        Parameters
+        ----------
+        id (optional): The ID of the table to export. Required if there is more than one logical table.
+        columns (optional): The names of the columns to export. All of them by default.
+        formatted (optional): Whether to write values as Tableau formats them, rather than their native values.
+        name (optional): The file name of the media. The datasource's name by default.
+        page_size (optional): The number of rows to read from Tableau at a time. 10,000 by default.
+
+        Returns
+        -------
+        :obj:`anvil.Media`
+
+        Example
+        -------
+        >>> anvil.media.download(datasource.export_csv(columns=['Order ID', 'Sales']))
+        """
+        from . import export
+
+        table_id = id or self._only_table_id()
+        options = _data_options(lambda: self._column_info(table_id), columns)
+        reader = self._proxy.getLogicalTableDataReaderAsync(
+            table_id, page_size or export.PAGE_SIZE, options
+        )
+        chunks = export.csv_chunks(
+            export.iter_pages(reader),
+            formatted,
+            column_info=lambda: _included_columns(self._column_info(table_id), columns),
+        )
+        return export.to_media(chunks, name or f"{self.name}.csv")
+
+    def join_tables(self, table_ids, on, columns=None):
+        """Joins logical tables of the datasource, and yields the joined records.
+
+        The tables are fetched concurrently and joined with a hash join, keeping
+        only the rows whose ``on`` columns match in every table (an inner join).
+
+        Parameters
+        ----------
+        table_ids : list
+            The ids of the logical tables to join, at least two.
+        on : str or list
+            The name of the column, or names of the columns, to join on. They must be
+            present in every table.
+        columns (optional): The names of the columns to include in the records. All
+            of them by default. Where tables share a column that isn't in ``on``, the
+            value from the first of them is kept.
+
+        Returns
+        -------
+        A generator of :obj:`dict`
+
+        Raises
+        ------
+        ValueError
+            If fewer than two tables are given.
+        KeyError
+            If a table is missing one of the ``on`` columns.
+
+        Example
+        -------
+        >>> ds.join_tables([orders_id, returns_id], on='Order ID', columns=['Order ID', 'Sales', 'Returned'])
         """
-        return self.get_underlying_table(id).get_records()
+        if len(table_ids) < 2:
+            raise ValueError("At least two tables are needed for a join.")
+        on = [on] if isinstance(on, str) else list(on)
+
+        def fetch(table_id):
+            return lambda: DataTable(self.getLogicalTableDataAsync(table_id))
+
+        tables = _gather([fetch(table_id) for table_id in table_ids])
+        from .query import join
+
+        return join(tables, on, columns)
 
     @property
     def underlying_table_info(self):
@@ -665,7 +1319,7 @@ class Datasource(TableauProxy):
         >>> ds.underlying_table_info
         [('Orders', 'Orders_6D2EF74F348B46BDA976A7AEEA6FB5C9'), ('People', 'People_37AF7429D04E4916914EED91681E5975'), ('Returns', 'Returns_11818460B7524AB795D23E763C65D6BC')]
         """
-        return [(table.caption, table.id) for table in self.getLogicalTablesAsync()]
+        return [(table.caption, table.id) for table in self._logical_tables()]
 
     def refresh(self):
         """
@@ -674,6 +1328,13 @@ class Datasource(TableauProxy):
         # Can we make this happen without blocking? Not sure how, call_async or something?
         # Yes, anvil labs has a non-blocking module which would handle that.
         self._proxy.refreshAsync()
+        session = _Tableau.session()
+        session.domains.invalidate()
+        session.schemas.invalidate()
+        # Only record the refresh if the table cache is in use, to avoid opening
+        # browser storage for extensions that never cache tables.
+        if session._tables is not None:
+            session.tables.refreshed(self.id)
 
 
 class Worksheet(TableauProxy):
@@ -685,6 +1346,14 @@ class Worksheet(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/worksheet.html>` and accessed through the ``Worksheet`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ("_datasources", "_summary_snapshot")
+    identifier = "name"
+
+    def __init__(self, proxy):
+        super().__init__(proxy)
+        self._datasources = None
+        self._summary_snapshot = None
+
     @property
     def columns(self):
         """Returns the columns of the worksheet as a dictionary with ``{colname: coltype}``.
@@ -697,23 +1366,65 @@ class Worksheet(TableauProxy):
         >>> ws.columns
         {'Customer Name': 'string', 'AGG(Profit Ratio)': 'float', 'SUM(Profit)': 'float', 'SUM(Sales)': 'float'}
         """
-        return _clean_columns(self.getSummaryColumnsInfoAsync())
+        return _clean_columns(self._summary_columns())
 
-    def _coalesce_data(self, data, collapse_measures, method_name):
+    def _summary_columns(self):
+        return _Tableau.session().schemas.get(
+            ("summary_columns", self.name), self._proxy.getSummaryColumnsInfoAsync
+        )
+
+    def _underlying_tables(self):
+        return _Tableau.session().schemas.get(
+            ("underlying_tables", self.name), self._proxy.getUnderlyingTablesAsync
+        )
+
+    def _column_info(self, table_id):
+        """The Tableau columns of an underlying table, read from a single row."""
+        return _Tableau.session().schemas.get(
+            ("underlying_columns", self.name, table_id),
+            lambda: self._proxy.getUnderlyingTableDataAsync(
+                table_id, {"maxRows": 1}
+            ).columns,
+        )
+
+    def _coalesce_data(self, data, collapse_measures, method_name, token=None):
         """
         Returns the records from multiple data tables.
         """
+        return list(self._iter_coalesced(data, collapse_measures, method_name, token))
+
+    def _iter_coalesced(self, data, collapse_measures, method_name, token=None):
+        """
+        Yields the records from multiple data tables, one table at a time.
+
+        Every record has the keys of all the tables, with None for the columns its
+        own table doesn't have.
+        """
         datatables = [DataTable(table) for table in data]
+        datatables = [table for table in datatables if len(table._proxy.data)]
         if len(datatables) > 1:
             print(
                 f"NOTE: {method_name} is returning data from multiple logical tables. \n"
-                "The returned list will likely have different keys from element to element."
+                "Records have the keys of every table, with None for missing values."
             )
-        return list(
-            itertools.chain(*[dt.get_records(collapse_measures) for dt in datatables])
-        )
+        table_keys = [table._record_keys(collapse_measures) for table in datatables]
+        keys = list(dict.fromkeys(k for tk in table_keys for k in tk))
+        if not collapse_measures and "Measure Names" in keys:
+            _measure_names_note()
+
+        for table, own_keys in zip(datatables, table_keys):
+            if collapse_measures:
+                records = table.get_records(collapse_measures, token)
+            else:
+                records = table._iter_records(token)
+            if own_keys == keys:
+                for record in records:
+                    yield record
+            else:
+                for record in records:
+                    yield {key: record.get(key) for key in keys}
 
-    def get_selected_marks(self, collapse_measures=False):
+    def get_selected_marks(self, collapse_measures=False, token=None):
         """The data for the marks which are currently selected on the worksheet.
         If there are no marks currently selected, an empty list is returned.
 
@@ -724,15 +1435,31 @@ class Worksheet(TableauProxy):
             measure names / measure values. This often happens when getting summary
             data for dual axis visualizations.
 
+        token : :obj:`~client_code.model.scheduling.CancellationToken`
+            If given, the conversion stops with EventCancelled once it is cancelled.
+
         Returns
         --------
         records : list
             Data for the currently selected marks on the worksheet
         """
         data = self._proxy.getSelectedMarksAsync()["data"]
-        return self._coalesce_data(data, collapse_measures, "get_selected_marks")
+        return self._coalesce_data(data, collapse_measures, "get_selected_marks", token)
+
+    def iter_selected_marks(self, collapse_measures=False, token=None):
+        """Like :obj:`get_selected_marks`, but yields the records one at a time rather
+        than building a list of them, which keeps memory down for large selections.
+
+        Returns
+        --------
+        A generator of :obj:`dict`
+        """
+        data = self._proxy.getSelectedMarksAsync()["data"]
+        return self._iter_coalesced(
+            data, collapse_measures, "iter_selected_marks", token
+        )
 
-    def get_highlighted_marks(self, collapse_measures=False):
+    def get_highlighted_marks(self, collapse_measures=False, token=None):
         """The data for the marks which are currently highlighted on the worksheet.
         If there are no marks currently highlighted, an empty list is returned.
 
@@ -743,14 +1470,41 @@ class Worksheet(TableauProxy):
             measure names / measure values. This often happens when getting summary
             data for dual axis visualizations.
 
+        token : :obj:`~client_code.model.scheduling.CancellationToken`
+            If given, the conversion stops with EventCancelled once it is cancelled.
+
         Returns
         --------
         :obj:`list` of :obj:`dicts`
         """
         data = self._proxy.getHighlightedMarksAsync()["data"]
-        return self._coalesce_data(data, collapse_measures, "get_highlighted_marks")
+        return self._coalesce_data(
+            data, collapse_measures, "get_highlighted_marks", token
+        )
+
+    def iter_highlighted_marks(self, collapse_measures=False, token=None):
+        """Like :obj:`get_highlighted_marks`, but yields the records one at a time
+        rather than building a list of them.
 
-    def get_underlying_data(self, table_id=None):
+        Returns
+        --------
+        A generator of :obj:`dict`
+        """
+        data = self._proxy.getHighlightedMarksAsync()["data"]
+        return self._iter_coalesced(
+            data, collapse_measures, "iter_highlighted_marks", token
+        )
+
+    def get_underlying_data(
+        self,
+        table_id=None,
+        token=None,
+        columns=None,
+        max_rows=None,
+        ignore_aliases=False,
+        include_data_values=None,
+        compact=False,
+    ):
         """Get the underlying data as a list of dictionaries (records).
 
         If more than one "underlying table" exists, the table id must be specified.
@@ -760,6 +1514,27 @@ class Worksheet(TableauProxy):
         table_id : str
             The table id for which to get the underlying data. Required if more than one logical table exists.
 
+        token : :obj:`~client_code.model.scheduling.CancellationToken`
+            If given, the conversion stops with EventCancelled once it is cancelled.
+
+        columns : list
+            The names of the columns to fetch. All of them by default.
+
+        max_rows : int
+            The maximum number of rows to fetch. All of them by default.
+
+        ignore_aliases : bool
+            Whether to fetch the values of the data rather than their aliases.
+
+        include_data_values : str
+            Which values Tableau sends for each cell: 'all-values' (the default) or
+            'only-native-values'. Records are built from the native values, so
+            'only-formatted-values' isn't supported.
+
+        compact : bool
+            Whether to return compact rows rather than dicts. See
+            :obj:`DataTable.get_records`.
+
         Returns
         -------
         :obj:`list` of :obj:`dicts`
@@ -767,28 +1542,118 @@ class Worksheet(TableauProxy):
         Raises
         -------
         ValueError
-            If more than one table_id exists, then a table must be specified.
+            If more than one table_id exists, then a table must be specified, or if
+            include_data_values isn't supported.
+        KeyError
+            If one of the columns doesn't exist.
+
+        Example
+        -------
+        >>> ws.get_underlying_data(columns=['Order ID', 'Sales'], max_rows=100)
         """
         ws = self._proxy
-
         if table_id is None:
-            # we need to get the only underlying table id.
-            tables = ws.getUnderlyingTablesAsync()
-            if len(tables) > 1:
-                raise ValueError(
-                    "More than one underlying table exists."
-                    "Need to specify the underlying table. "
-                    "You can get the underlying table information using the "
-                    "underlying_table_info property. "
-                    f"\nValid tables: {self.underlying_table_info}"
-                )
+            table_id = self._only_table_id()
+
+        def fetch(options):
+            if options:
+                return ws.getUnderlyingTableDataAsync(table_id, options)
+            return ws.getUnderlyingTableDataAsync(table_id)
+
+        options = _data_options(
+            lambda: self._column_info(table_id),
+            columns,
+            max_rows,
+            ignore_aliases,
+            include_data_values,
+        )
+        datatable = DataTable(fetch(options))
+        return datatable.get_records(token=token, compact=compact)
 
-            table_id = tables[0].id
+    def _only_table_id(self):
+        """The id of the worksheet's underlying table, if it only has one."""
+        tables = self._underlying_tables()
+        if len(tables) > 1:
+            raise ValueError(
+                "More than one underlying table exists."
+                "Need to specify the underlying table. "
+                "You can get the underlying table information using the "
+                "underlying_table_info property. "
+                f"\nValid tables: {self.underlying_table_info}"
+            )
+        return tables[0].id
+
+    def export_csv(
+        self,
+        table_id=None,
+        summary=False,
+        columns=None,
+        formatted=False,
+        name=None,
+        page_size=None,
+    ):
+        """Exports the worksheet's underlying or summary data as a CSV file.
+
+        The data is read from Tableau a page at a time, and each page is written out
+        before the next is read, so memory use doesn't grow with the data.
 
-        datatable = DataTable(ws.getUnderlyingTableDataAsync(table_id))
-        return datatable.get_records()
+        Parameters
+        ----------
+        table_id : str
+            The underlying table to export. Required if more than one exists, and
+            ignored for summary data.
+
+        summary : bool
+            Whether to export the summary data rather than an underlying table.
+
+        columns : list
+            The names of the columns to export. All of them by default.
+
+        formatted : bool
+            Whether to write values as Tableau formats them, rather than their native
+            values.
+
+        name : str
+            The file name of the media. The worksheet's name by default.
+
+        page_size : int
+            The number of rows to read from Tableau at a time. 10,000 by default.
+
+        Returns
+        -------
+        :obj:`anvil.Media`
+
+        Example
+        -------
+        >>> anvil.media.download(self.worksheet.export_csv(summary=True))
+        """
+        from . import export
 
-    def get_summary_data(self, ignore_selection=True, collapse_measures=False):
+        ws = self._proxy
+        page_size = page_size or export.PAGE_SIZE
+        if summary:
+            column_info = self._summary_columns
+            options = _data_options(column_info, columns)
+            options["ignoreSelection"] = True
+            reader = ws.getSummaryDataReaderAsync(page_size, options)
+        else:
+            table_id = table_id or self._only_table_id()
+
+            def column_info():
+                return self._column_info(table_id)
+
+            options = _data_options(column_info, columns)
+            reader = ws.getUnderlyingTableDataReaderAsync(table_id, page_size, options)
+        chunks = export.csv_chunks(
+            export.iter_pages(reader),
+            formatted,
+            column_info=lambda: _included_columns(column_info(), columns),
+        )
+        return export.to_media(chunks, name or f"{self.name}.csv")
+
+    def get_summary_data(
+        self, ignore_selection=True, collapse_measures=False, token=None, compact=False
+    ):
         """Returns the summary data from a worksheet.
 
         Parameters
@@ -801,6 +1666,13 @@ class Worksheet(TableauProxy):
             measure names / measure values. This often happens when getting summary
             data for dual axis visualizations.
 
+        token : :obj:`~client_code.model.scheduling.CancellationToken`
+            If given, the conversion stops with EventCancelled once it is cancelled.
+
+        compact : bool
+            Whether to return compact rows rather than dicts. See
+            :obj:`DataTable.get_records`.
+
         Returns
         ---------
         :obj:`list` of :obj:`dict`
@@ -808,22 +1680,88 @@ class Worksheet(TableauProxy):
         datatable = DataTable(
             self._proxy.getSummaryDataAsync({"ignoreSelection": ignore_selection})
         )
-        return datatable.get_records(collapse_measures)
+        return datatable.get_records(collapse_measures, token, compact)
+
+    def get_summary_changes(
+        self,
+        ignore_selection=True,
+        collapse_measures=False,
+        key_columns=None,
+        token=None,
+    ):
+        """Returns the changes to the summary data since the last call.
+
+        The worksheet keeps the summary data from the previous call, indexed by its
+        dimension columns, so that handlers can update only the rows that changed
+        rather than re-rendering everything. On the first call, every row is inserted,
+        as it is when ``ignore_selection``, ``collapse_measures`` or ``key_columns``
+        differ from the last call's, which starts a new snapshot.
+
+        Parameters
+        ---------
+        ignore_selection : bool
+            Whether or not to ignore the selected marks when getting summary data.
+
+        collapse_measures : bool
+            Whether or not to try and collapse records on worksheets that use
+            measure names / measure values.
+
+        key_columns : list
+            The names of the columns that identify a row. By default, every column
+            that isn't an aggregated measure such as ``SUM(Sales)`` (see
+            :obj:`~client_code.model.diff.is_measure_column`).
+
+        token : :obj:`~client_code.model.scheduling.CancellationToken`
+            If given, the conversion stops with EventCancelled once it is cancelled.
+            The snapshot is left as it was.
+
+        Returns
+        ---------
+        :obj:`dict` with keys ``inserted``, ``updated`` and ``deleted``, each a
+        :obj:`list` of :obj:`dict`. Deleted rows are given as they were last seen.
+
+        Example
+        -------
+        >>> def filter_changed(event):
+        ...     changes = event.worksheet.get_summary_changes()
+        ...     anvil.server.call('save_rows', changes['inserted'] + changes['updated'])
+        """
+        records = self.get_summary_data(ignore_selection, collapse_measures, token)
+        options = (
+            ignore_selection,
+            collapse_measures,
+            None if key_columns is None else tuple(key_columns),
+        )
+        if self._summary_snapshot is None or self._summary_snapshot[0] != options:
+            from .diff import SummarySnapshot
+
+            self._summary_snapshot = (options, SummarySnapshot(key_columns))
+        return self._summary_snapshot[1].update(records)
 
-    def select_marks(self, dimension, selection_type="select-replace"):
+    def select_marks(
+        self, dimension, selection_type="select-replace", return_marks=True
+    ):
         """Selects the marks and returns them.
 
-        This version selects by value, using the SelectionCriteria interface.
+        This version selects by value, using the SelectionCriteria interface. All the
+        values given for a field are sent as a single criterion, so the selection is
+        one call to Tableau however many values it contains.
 
         Note that this doesnt work on scatter plots.
 
         Parameters
         ----------
         dimension : dict or list of dict
+            Values to select, keyed on field name. A value can be a single value, a
+            list of values, or a dict with 'min' and 'max' keys to select a range.
 
         optional selection_type : str
             The type of enum to be applied to the marks
 
+        optional return_marks : bool
+            Whether to read back and return the selected marks. Set this to False to
+            skip fetching the selection from Tableau.
+
         Example
         ----------
 
@@ -833,6 +1771,8 @@ class Worksheet(TableauProxy):
         >>> bc.select_marks({'Region': 'Asia'})
 
         And the Bar with the "Asia" Region will become selected.
+
+        >>> bc.select_marks({'Region': ['Asia', 'Europe'], 'Sales': {'min': 0, 'max': 1000}}, return_marks=False)
         """
         selection_enums = ("select-replace", "select-add", "select-remove")
         if selection_type not in selection_enums:
@@ -840,13 +1780,10 @@ class Worksheet(TableauProxy):
                 f"Invalid selection type '{selection_type}'. "
                 f"Valid values: {', '.join(selection_enums)}"
             )
-        if not isinstance(dimension, list):
-            dimension = [dimension]
-        selection = [
-            {"fieldName": k, "value": [v]} for d in dimension for k, v in d.items()
-        ]
+        selection = _selection_criteria(dimension)
         self._proxy.selectMarksByValueAsync(selection, selection_type)
-        return self.get_selected_marks()
+        if return_marks:
+            return self.get_selected_marks()
 
     def clear_selection(self):
         """Clears the current marks selection."""
@@ -939,12 +1876,28 @@ class Worksheet(TableauProxy):
 
         optional update_type : str
             The type of update to be applied to the filter
+
+        Long lists of values are sent to Tableau in several calls.
         """
         self._check_for_existing_filter(field_name, "categorical")
         if not isinstance(values, list):
             values = [values]
 
-        self._proxy.applyFilterAsync(field_name, values, update_type)
+        self._apply_categorical_values(field_name, values, update_type)
+
+    def _apply_categorical_values(self, field_name, values, update_type):
+        """Calls applyFilterAsync, splitting ``values`` into chunks if needed.
+
+        For a 'replace', only the first chunk replaces the values; the rest are added.
+        """
+        chunks = [
+            values[i : i + _FILTER_CHUNK_SIZE]
+            for i in range(0, len(values), _FILTER_CHUNK_SIZE)
+        ] or [values]
+        for chunk in chunks:
+            self._proxy.applyFilterAsync(field_name, chunk, update_type)
+            if update_type == "replace":
+                update_type = "add"
 
     def apply_range_filter(self, field_name, min, max):
         """Applies a range filter.
@@ -971,7 +1924,7 @@ class Worksheet(TableauProxy):
 
         :type: :obj:`list`
         """
-        return [Parameter(p) for p in self._proxy.getParametersAsync()]
+        return [Parameter._wrap(p) for p in self._proxy.getParametersAsync()]
 
     def get_parameter(self, parameter_name):
         """Getting the parameter information for the given parameter name.
@@ -997,7 +1950,7 @@ class Worksheet(TableauProxy):
                 f"Parameters on Dashboard: {[p.name for p in self.parameters]}"
             )
         else:
-            return Parameter(param_js)
+            return Parameter._wrap(param_js)
 
     @property
     def datasources(self) -> list[Datasource]:
@@ -1009,7 +1962,11 @@ class Worksheet(TableauProxy):
             The primary data source and all of the secondary data sources for this
             worksheet.
         """
-        return [Datasource(ds) for ds in self._proxy.getDataSourcesAsync()]
+        if self._datasources is None:
+            self._datasources = [
+                Datasource._wrap(ds) for ds in self._proxy.getDataSourcesAsync()
+            ]
+        return list(self._datasources)
 
     @property
     def underlying_table_info(self):
@@ -1020,17 +1977,14 @@ class Worksheet(TableauProxy):
 
         type : :obj:`list` of :obj:`tuple` (caption, id)
         """
-        return [
-            (table.caption, table.id)
-            for table in self._proxy.getUnderlyingTablesAsync()
-        ]
+        return [(table.caption, table.id) for table in self._underlying_tables()]
 
     @function_type_hint.event_handler_enum(
         selection_changed=EventHandler(event_type=MarksSelectedEvent),
         filter_changed=EventHandler(event_type=FilterChangedEvent),
         parameter_changed=EventHandler(event_type=ParameterChangedEvent),
     )
-    def register_event_handler(self, event_type, handler):
+    def register_event_handler(self, event_type, handler, policy=None):
         """Register an event handling function for a given event type.
 
         You can register ``selection_changed`` and ``filter_changed`` events at the
@@ -1050,6 +2004,8 @@ class Worksheet(TableauProxy):
             The event type to register the handler for.
         handler : function
             The function to call when the event is triggered. ``handler`` must take an event instance as an argument.
+        policy : None or 'latest'
+            How to schedule the handler. See :obj:`Dashboard.register_event_handler`.
         """
         session = _Tableau.session()
         if event_type in [
@@ -1058,11 +2014,11 @@ class Worksheet(TableauProxy):
             events.SELECTION_CHANGED,
             events.FILTER_CHANGED,
         ]:
-            session.register_event_handler(event_type, handler, self)
+            session.register_event_handler(event_type, handler, self, policy)
 
         elif event_type in ["parameter_changed", events.PARAMETER_CHANGED]:
             for p in self.parameters:
-                p.register_event_handler(handler)
+                p.register_event_handler(handler, policy)
 
         else:
             raise NotImplementedError(
@@ -1120,6 +2076,8 @@ class Settings(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/settings.html>` and accessed through the ``Setting`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ()
+
     def _setkey(self, key, value):
         if key is None:
             raise KeyError("'None' is not a valid key for settings.")
@@ -1266,15 +2224,48 @@ class Dashboard(TableauProxy):
         A full listing of all methods and attributes of the underlying JS object can be viewed in the :bdg-link-primary-line:`Tableau Docs <https://tableau.github.io/extensions-api/docs/interfaces/dashboard.html>` and accessed through the ``Dashboard`` object's ``._proxy`` attribute.
     """
 
+    __slots__ = ("_worksheets", "_parameters")
     identifier = "id"
 
     def __init__(self, proxy):
         super().__init__(proxy)
-        self.refresh()
+        self._worksheets = None
+        self._parameters = None
 
     def refresh(self):
         """Refreshes the worksheets in the live Tableau Instance."""
-        self._worksheets = {ws.name: Worksheet(ws) for ws in self._proxy.worksheets}
+        self._worksheets = {
+            ws.name: Worksheet._wrap(ws) for ws in self._proxy.worksheets
+        }
+        self._parameters = None
+        for ws in self._worksheets.values():
+            ws._datasources = None
+        _Tableau.session().schemas.invalidate()
+
+    def _worksheet_map(self):
+        """The worksheets keyed on name, built on first use."""
+        if self._worksheets is None:
+            self.refresh()
+        return self._worksheets
+
+    def preload(self, background=True):
+        """Fetches the worksheets, parameters and datasources ahead of their first use.
+
+        The parameters and the datasources of each worksheet are fetched concurrently.
+
+        Parameters
+        ----------
+        background : bool
+            If True (the default), return immediately and do the work once the current
+            code yields to the browser, e.g. once the start-up form has been shown.
+        """
+        if background:
+            _call_soon(lambda: self.preload(background=False))
+            return
+
+        fetches = [lambda: self.parameters]
+        fetches.extend(lambda ws=ws: ws.datasources for ws in self.worksheets)
+        _gather(fetches)
 
     def __getitem__(self, idx):
         return self.get_worksheet(idx)
@@ -1300,7 +2291,7 @@ class Dashboard(TableauProxy):
 
         :type: :obj:`list` of :obj:`Worksheet`
         """
-        return [Worksheet(ws._proxy) for ws in self._worksheets.values()]
+        return list(self._worksheet_map().values())
 
     def get_worksheet(self, sheet_name):
         """Gets a dashboard worksheet by name.
@@ -1320,11 +2311,11 @@ class Dashboard(TableauProxy):
             If no matching worksheet is found
         """
         try:
-            return self._worksheets[sheet_name]
+            return self._worksheet_map()[sheet_name]
         except KeyError:
             raise KeyError(
                 f"Worksheet {sheet_name} doesn't exist. "
-                f"Worksheets in dashboard: {list(self._worksheets.keys())}"
+                f"Worksheets in dashboard: {list(self._worksheet_map().keys())}"
             )
 
     @property
@@ -1344,7 +2335,11 @@ class Dashboard(TableauProxy):
 
         :type: :obj:`list` of :obj:`Parameter`
         """
-        return [Parameter(p) for p in self._proxy.getParametersAsync()]
+        if self._parameters is None:
+            self._parameters = [
+                Parameter._wrap(p) for p in self._proxy.getParametersAsync()
+            ]
+        return list(self._parameters)
 
     def get_parameter(self, parameter_name):
         """Returns the parameter matching the provided parameter_name.
@@ -1370,7 +2365,7 @@ class Dashboard(TableauProxy):
                 f"Parameters on Dashboard: {[p.name for p in self.parameters]}"
             )
         else:
-            return Parameter(param_js)
+            return Parameter._wrap(param_js)
 
     @property
     def datasources(self):
@@ -1391,7 +2386,7 @@ class Dashboard(TableauProxy):
                     known_ids.add(uid)
                     all_datasources.append(ds)
 
-        return [Datasource(ds._proxy) for ds in all_datasources]
+        return all_datasources
 
     def get_datasource(self, datasource_name):
         """Returns a Tableau data source by its name (case sensitive).
@@ -1418,7 +2413,7 @@ class Dashboard(TableauProxy):
                 f"Datasources in Dashboard: {[ds.name for ds in self.datasources]}"
             )
         else:
-            return Datasource(ds[0]._proxy)
+            return ds[0]
 
     def get_datasource_by_id(self, datasource_id):
         """Returns a Tableau data source object by id.
@@ -1445,7 +2440,7 @@ class Dashboard(TableauProxy):
                 f"Datasource IDs in Dashboard: {[ds.id for ds in self.datasource_id]}"
             )
         else:
-            return Datasource(ds[0]._proxy)
+            return ds[0]
 
     def refresh_data_sources(self):
         """Refresh all data sources for the Tableau dashboard.
@@ -1462,7 +2457,7 @@ class Dashboard(TableauProxy):
         filter_changed=EventHandler(event_type=FilterChangedEvent),
         parameter_changed=EventHandler(event_type=ParameterChangedEvent),
     )
-    def register_event_handler(self, event_type, handler):
+    def register_event_handler(self, event_type, handler, policy=None):
         """Register an event handling function for a given event type.
 
         You can register ``selection_changed`` and ``filter_changed`` events at the
@@ -1470,12 +2465,20 @@ class Dashboard(TableauProxy):
 
         Selections or filters changed anywhere in the dashboard will be handled.
 
+        By default, the handler is called for every event. With ``policy="latest"``,
+        events that arrive while the handler is still running replace each other, so
+        that only the latest one is handled once it finishes, and the running call is
+        told to give up through its ``event.token``
+        (see :obj:`~client_code.model.scheduling.CancellationToken`).
+
         Parameters
         ----------
         event_type : str
             The event type to register the handler for.
         handler : function
             The function to call when the event is triggered.
+        policy : None or 'latest'
+            How to schedule the handler.
         """
         if event_type in [
             "selection_changed",
@@ -1484,11 +2487,11 @@ class Dashboard(TableauProxy):
             events.FILTER_CHANGED,
         ]:
             for ws in self.worksheets:
-                ws.register_event_handler(event_type, handler)
+                ws.register_event_handler(event_type, handler, policy)
 
         elif event_type in ["parameter_changed", events.PARAMETER_CHANGED]:
             for p in self.parameters:
-                p.register_event_handler(handler)
+                p.register_event_handler(handler, policy)
 
         else:
             raise NotImplementedError(
@@ -1496,11 +2499,52 @@ class Dashboard(TableauProxy):
                 f"parameter_changed from the Dashboard object. You passed: {event_type}"
             )
 
+    def set_parameters(self, values):
+        """Changes the values of several parameters at once.
+
+        The parameters are looked up together, the changes are sent to Tableau
+        concurrently, and handlers registered for ``parameter_changed`` are called once,
+        after all the changes, with the last event they would have received.
+
+        Parameters
+        ----------
+        values : dict
+            The new values keyed on parameter name. Dates and datetimes are converted to
+            UTC dates.
+
+        Raises
+        --------
+        KeyError
+            If any of the names doesn't match a parameter. No parameter is changed.
+
+        Example
+        -------
+        >>> dashboard.set_parameters({'Discount': 0.1, 'Start Date': dt.date(2023, 1, 1)})
+        """
+        parameters = {p.name: p for p in self.parameters}
+        missing = [name for name in values if name not in parameters]
+        if missing:
+            raise KeyError(
+                f"No matching parameters found for {missing}. "
+                f"Parameters on Dashboard: {list(parameters)}"
+            )
+
+        changes = [(parameters[name], _to_js_date(v)) for name, v in values.items()]
+        session = _Tableau.session()
+        session._hold_parameter_events()
+        try:
+            data_values = _gather(
+                [lambda p=p, v=v: p._proxy.changeValueAsync(v) for p, v in changes]
+            )
+        finally:
+            session._release_parameter_events()
+
+        for (parameter, _), data_value in zip(changes, data_values):
+            session.parameter_values.set(parameter, data_value)
+
     def unregister_all_event_handlers(self):
-        for w in self.worksheets:
-            w.unregister_all_event_handlers()
-        for p in self.parameters:
-            p.unregister_all_event_handlers()
+        session = _Tableau.session()
+        session.unregister_all_event_handlers()
 
     @property
     def settings(self):
@@ -1550,7 +2594,6 @@ class _Tableau:
         """
         if cls._session is None:
             cls._session = _Tableau()
-            cls._session.available
         return cls._session
 
     def __init__(self):
@@ -1560,17 +2603,53 @@ class _Tableau:
         self.timeout = None
         self.event_type_mapper = _EventTypeMapper()
         self._proxy = tableau.extensions
+        # (target class, target id, event type) -> _Listener
         self.callbacks = {}
-        self.dashboard = Dashboard(tableau.extensions.dashboardContent.dashboard)
+        self._handler_index = {}
+        self._target_index = {}
+        self._schedulers = {}
+        self._dashboard = None
+        self.parameter_values = _ParameterValues(self)
+        self.domains = _DomainCache(self)
+        self._tables = None
+        self.schemas = _SchemaCache()
+        self._hold_depth = 0
+        self._held_events = {}
+
+    @property
+    def dashboard(self):
+        """The Dashboard the extension is embedded in, created on first use.
+
+        :type: :obj:`Dashboard`
+        """
+        if self._dashboard is None:
+            self._dashboard = Dashboard._wrap(self._proxy.dashboardContent.dashboard)
+        return self._dashboard
+
+    @property
+    def tables(self):
+        """The session's cache of logical tables in browser storage, created on first
+        use.
+
+        :type: :obj:`~client_code.model.storage.TableCache`
+        """
+        if self._tables is None:
+            from .storage import TableCache
+
+            self._tables = TableCache()
+        return self._tables
 
     @property
     def available(self):
         """Whether the current session is yet available."""
         return self.dashboard._proxy is not None
 
-    def register_event_handler(self, event_type, handler, targets):
+    def register_event_handler(self, event_type, handler, targets, policy=None):
         """Register an event handling function for a given event type.
 
+        There is a single Tableau listener per target and event type, which calls each
+        of the handlers registered for them in turn.
+
         Parameters
         ----------
         event_type : str
@@ -1580,6 +2659,9 @@ class _Tableau:
             The function to call when the event is triggered.
         targets : list
             The list of targets to register the handler for.
+        policy : None or 'latest'
+            How to schedule the handler, see scheduling.scheduled. A handler
+            registered for several targets shares one scheduler across them.
         """
         if not self.available:
             raise ValueError("No tableau session is available")
@@ -1598,43 +2680,260 @@ class _Tableau:
         except TypeError:
             targets = (targets,)
 
-        reporting_handler = report_exceptions(handler)
-        if event_type == events.FILTER_CHANGED:
-            reporting_handler = _suppress_duplicate_events(reporting_handler)
-        tableau_event = self.event_type_mapper.tableau_event(event_type)
-
-        def wrapper(event):
-            wrapped_event = self.event_type_mapper.proxy(event)
-            reporting_handler(wrapped_event)
+        scheduler_key = (handler, event_type, policy)
+        if scheduler_key not in self._schedulers:
+            reporting_handler = report_exceptions(scheduling.scheduled(handler, policy))
+            if event_type == events.FILTER_CHANGED:
+                reporting_handler = _suppress_duplicate_events(reporting_handler)
+            self._schedulers[scheduler_key] = reporting_handler
+        reporting_handler = self._schedulers[scheduler_key]
 
         for target in targets:
-            identifier = (target.__class__, target.id, handler, event_type)
-            self.callbacks[identifier] = target._proxy.addEventListener(
-                tableau_event, wrapper
-            )
+            listener = self._listener(target, event_type)
+            listener.handlers[handler] = reporting_handler
+            self._handler_index.setdefault(handler, set()).add(listener.key)
+        self._prune_schedulers(handler, event_type)
+
+    def _listener(self, target, event_type):
+        """Returns the listener for ``target`` and ``event_type``, creating it if needed."""
+        key = (target.__class__, target.id, event_type)
+        listener = self.callbacks.get(key)
+        if listener is None:
+            listener = self.callbacks[key] = _Listener(self, key, target)
+            self._target_index.setdefault(key[:2], set()).add(key)
+        return listener
+
+    def _add_hook(self, target, event_type, hook):
+        """Calls ``hook`` with each ``event_type`` event from ``target``, before any
+        handler. Hooks keep the session's caches up to date and are never removed."""
+        self._listener(target, event_type).hooks.append(report_exceptions(hook))
+
+    def _remove_handler(self, key, handler):
+        listener = self.callbacks[key]
+        del listener.handlers[handler]
+        keys = self._handler_index[handler]
+        keys.discard(key)
+        if not keys:
+            del self._handler_index[handler]
+        if not listener.handlers and not listener.hooks:
+            listener.remove()
+            del self.callbacks[key]
+            self._target_index[key[:2]].discard(key)
+        self._prune_schedulers(handler, key[2])
+
+    def _prune_schedulers(self, handler, event_type):
+        """Forgets the wrapped handlers for ``handler`` and ``event_type`` that no
+        listener uses any more, so that unbound handlers can be garbage collected and
+        start afresh if they are registered again."""
+        in_use = [
+            self.callbacks[key].handlers[handler]
+            for key in self._handler_index.get(handler, ())
+            if key[2] == event_type
+        ]
+        for policy in scheduling.policies:
+            scheduler_key = (handler, event_type, policy)
+            scheduler = self._schedulers.get(scheduler_key)
+            if scheduler is not None and not any(s is scheduler for s in in_use):
+                del self._schedulers[scheduler_key]
+
+    def _hold_parameter_events(self):
+        """Holds back parameter-changed events until _release_parameter_events.
+
+        Only the last event for each handler is kept.
+        """
+        self._hold_depth += 1
+
+    def _release_parameter_events(self):
+        """Calls each handler once with the last event held back for it."""
+        self._hold_depth -= 1
+        if self._hold_depth:
+            return
+        held, self._held_events = self._held_events, {}
+        for reporting_handler, event in held.values():
+            reporting_handler(event)
 
     def unregister_event_handler(self, target, handler, event_type=None):
+        target_key = (target.__class__, target.id)
+        keys = [
+            key for key in self._handler_index.get(handler, ()) if key[:2] == target_key
+        ]
         if event_type is not None:
-            identifier = (target.__class__, target.id, handler, event_type)
+            keys = [key for key in keys if key[2] == event_type]
+        if not keys:
+            raise KeyError(f"Handler {handler} is not registered on {target}")
+        elif len(keys) > 1:
+            raise ValueError(
+                "Handler has multiple registrations. Specify the event type"
+            )
+        self._remove_handler(keys[0], handler)
+
+    def unregister_all_event_handlers(self, target=None):
+        """Unregisters every handler from ``target``, or from every target if None."""
+        if target is None:
+            keys = list(self.callbacks)
         else:
-            identifiers = [
-                k
-                for k in self.callbacks
-                if target.__class__ == k[0] and target.id == k[1] and handler == k[2]
-            ]
-            if len(identifiers) > 1:
-                raise ValueError(
-                    "Handler has multiple registrations. Specify the event type"
+            keys = list(self._target_index.get((target.__class__, target.id), ()))
+        for key in keys:
+            for handler in list(self.callbacks[key].handlers):
+                self._remove_handler(key, handler)
+
+
+class _Listener:
+    """The single Tableau listener for one target and event type.
+
+    Each event is wrapped once and passed to the session's hooks, then to every handler.
+    """
+
+    def __init__(self, session, key, target):
+        self.session = session
+        self.key = key
+        self.handlers = {}
+        self.hooks = []
+        tableau_event = session.event_type_mapper.tableau_event(key[2])
+        self.remove = target._proxy.addEventListener(tableau_event, self.dispatch)
+
+    def dispatch(self, event):
+        session = self.session
+        wrapped_event = session.event_type_mapper.proxy(event)
+        for hook in self.hooks:
+            hook(wrapped_event)
+        hold = session._hold_depth and self.key[2] == events.PARAMETER_CHANGED
+        for handler, reporting_handler in list(self.handlers.items()):
+            if hold:
+                session._held_events[handler] = (reporting_handler, wrapped_event)
+            else:
+                reporting_handler(wrapped_event)
+
+
+class _ParameterValues:
+    """The session's copy of the current value of each parameter.
+
+    Values are read from Tableau for every parameter at once, on first use, and are
+    then updated from parameter-changed events rather than read on every access. The
+    same events clear each parameter's cached allowable values.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._values = None
+
+    def _track(self, parameter):
+        if parameter.id not in self._values:
+            self._session._add_hook(
+                parameter, events.PARAMETER_CHANGED, self._on_change
+            )
+        self._values[parameter.id] = native_value_date_handler(
+            parameter._proxy.currentValue.nativeValue
+        )
+
+    def watch(self):
+        """Starts tracking the parameters, if that hasn't happened yet."""
+        if self._values is None:
+            self._values = {}
+            for parameter in self._session.dashboard.parameters:
+                self._track(parameter)
+
+    def _on_change(self, event):
+        parameter = Parameter._wrap(event.getParameterAsync())
+        parameter._clear_cache()
+        self.set(parameter)
+
+    def get(self, parameter, fresh=False):
+        """Returns the value of ``parameter``, reading it from Tableau if ``fresh``."""
+        self.watch()
+        if fresh or parameter.id not in self._values:
+            parameter._refresh()
+            parameter._clear_cache()
+            self._track(parameter)
+        return self._values[parameter.id]
+
+    def set(self, parameter, data_value=None):
+        """Records the value of ``parameter``: ``data_value`` if given, otherwise the
+        current value of its proxy."""
+        if self._values is None:
+            return
+        if data_value is not None:
+            self._values[parameter.id] = native_value_date_handler(
+                data_value.nativeValue
+            )
+        else:
+            self._track(parameter)
+
+
+class _DomainCache:
+    """The session's converted filter domains.
+
+    Domains are keyed on (worksheet, field, filter type, domain type). 'relevant'
+    domains depend on the other filters, so every filter-changed event clears them,
+    while 'database' domains are only cleared when a datasource is refreshed.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._domains = {}
+        self._generation = 0
+        self._watching = False
+
+    def watch(self):
+        """Starts listening for filter changes, if that hasn't happened yet."""
+        if not self._watching:
+            self._watching = True
+            for ws in self._session.dashboard.worksheets:
+                self._session._add_hook(
+                    ws, events.FILTER_CHANGED, self._on_filter_changed
                 )
-            identifier = identifiers[0]
-        self.callbacks.pop(identifier)()
 
-    def unregister_all_event_handlers(self, target):
-        identifiers = [
-            k for k in self.callbacks if target.__class__ == k[0] and target.id == k[1]
-        ]
-        for identifier in identifiers:
-            self.callbacks.pop(identifier)()
+    def _on_filter_changed(self, event):
+        self.invalidate("relevant")
+
+    def invalidate(self, domain_type=None):
+        """Drops the cached domains of ``domain_type``, or every cached domain."""
+        self._generation += 1
+        self._domains = {
+            k: v
+            for k, v in self._domains.items()
+            if domain_type is not None and k[-1] != domain_type
+        }
+
+    def get(self, filter, domain_type, fetch, fresh=False):
+        """Returns the cached domain of ``filter``, calling ``fetch(domain_type)`` to
+        read it from Tableau if needed."""
+        key = (
+            filter.worksheet_name,
+            filter.field_name,
+            filter.filter_type,
+            domain_type,
+        )
+        if not fresh and key in self._domains:
+            return self._domains[key]
+
+        self.watch()
+        generation = self._generation
+        domain = fetch(domain_type)
+        # Don't keep a domain that a change may have made stale while it was fetched.
+        if generation == self._generation:
+            self._domains[key] = domain
+        return domain
+
+
+class _SchemaCache:
+    """The session's column metadata and lists of tables.
+
+    Entries are keyed on (kind, owner, ...). They can only change when a datasource is
+    refreshed, which clears them all.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, key, fetch):
+        """Returns the entry for ``key``, calling ``fetch()`` to read it if needed."""
+        if key not in self._entries:
+            self._entries[key] = fetch()
+        return self._entries[key]
+
+    def invalidate(self):
+        self._entries = {}
 
 
 class _EventTypeMapper:
@@ -0,0 +1,385 @@
+import heapq
+import itertools
+
+
+def _sum(values):
+    return sum(v for v in values if v is not None)
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def _count(values):
+    return sum(1 for v in values if v is not None)
+
+
+def _distinct(values):
+    return len({v for v in values if v is not None})
+
+
+def _min(values):
+    values = [v for v in values if v is not None]
+    return min(values) if values else None
+
+
+def _max(values):
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+AGGREGATES = {
+    "sum": _sum,
+    "mean": _mean,
+    "count": _count,
+    "distinct": _distinct,
+    "min": _min,
+    "max": _max,
+}
+
+
+def _ascending(value):
+    # Sorts None after every other value, rather than failing to compare it.
+    return (value is None, value)
+
+
+def _descending(value):
+    # Sorts None after every other value once the order is reversed.
+    return (value is not None, value)
+
+
+class Query:
+    """A query over the rows of a :obj:`~client_code.model.proxies.DataTable`.
+
+    Queries are built by chaining methods, each of which returns a new query, and
+    only run when their results are read with :obj:`records` or by iterating over
+    them. Only the columns a query uses are converted from the Tableau data, and each
+    of them only once per table.
+
+    Usually created with :obj:`~client_code.model.proxies.DataTable.query`.
+
+    Example
+    -------
+    >>> table = datasource.get_underlying_table(orders_id)
+    >>> (
+    ...     table.query()
+    ...     .where("Region", "West")
+    ...     .group_by("Category")
+    ...     .agg(sales=("sum", "Sales"), orders=("distinct", "Order ID"))
+    ...     .top(3, "sales")
+    ...     .records()
+    ... )
+    [{'Category': 'Technology', 'sales': 251991.8, 'orders': 586}, ...]
+    """
+
+    def __init__(
+        self,
+        table,
+        columns=None,
+        filters=(),
+        groups=None,
+        aggregates=None,
+        order=(),
+        descending=False,
+        limit=None,
+    ):
+        self.table = table
+        self._columns = columns
+        self._filters = filters
+        self._groups = groups
+        self._aggregates = aggregates
+        self._order = order
+        self._descending = descending
+        self._limit = limit
+
+    def _replace(self, **changes):
+        state = {
+            "columns": self._columns,
+            "filters": self._filters,
+            "groups": self._groups,
+            "aggregates": self._aggregates,
+            "order": self._order,
+            "descending": self._descending,
+            "limit": self._limit,
+        }
+        state.update(changes)
+        return Query(self.table, **state)
+
+    def select(self, *columns):
+        """Only return the given columns."""
+        return self._replace(columns=columns)
+
+    def where(self, column, test):
+        """Only keep the rows whose value in ``column`` passes ``test``.
+
+        Parameters
+        ----------
+        column : str
+            The name of the column to test.
+        test : function or value
+            Either a function taking the value and returning whether to keep the row,
+            or a value the row's value must be equal to.
+        """
+        if not callable(test):
+            expected = test
+
+            def test(value):
+                return value == expected
+
+        return self._replace(filters=self._filters + ((column, test),))
+
+    def group_by(self, *columns):
+        """Group the rows on the values of ``columns``. Use with :obj:`agg`."""
+        return self._replace(groups=columns)
+
+    def agg(self, **aggregates):
+        """Aggregate the rows of each group, or all the rows if there are no groups.
+
+        Each keyword gives the name of an output column, and a tuple of the aggregate
+        (``sum``, ``mean``, ``count``, ``distinct``, ``min`` or ``max``) and the
+        column to aggregate.
+        """
+        for name, (aggregate, column) in aggregates.items():
+            if aggregate not in AGGREGATES:
+                raise ValueError(
+                    f"Unknown aggregate '{aggregate}' for '{name}'. "
+                    f"Valid aggregates: {', '.join(AGGREGATES)}"
+                )
+        return self._replace(groups=self._groups or (), aggregates=aggregates)
+
+    def order_by(self, *columns, descending=False):
+        """Sort the rows on the values of ``columns``. None sorts last."""
+        return self._replace(order=columns, descending=descending)
+
+    def limit(self, n):
+        """Only return the first ``n`` rows."""
+        return self._replace(limit=n)
+
+    def top(self, n, *columns, descending=True):
+        """The first ``n`` rows in the order of ``columns``, largest first by default.
+
+        Faster than sorting every row when ``n`` is small.
+        """
+        return self._replace(order=columns, descending=descending, limit=n)
+
+    def _row_ids(self):
+        """The positions of the rows passing every filter."""
+        rows = range(len(self.table._proxy.data))
+        for column, test in self._filters:
+            values = self.table.column(column)
+            rows = [i for i in rows if test(values[i])]
+        return rows
+
+    def _grouped(self, rows):
+        """The records for each group of ``rows``."""
+        groups = {}
+        keys = [self.table.column(c) for c in self._groups]
+        for i in rows:
+            key = tuple(values[i] for values in keys)
+            members = groups.get(key)
+            if members is None:
+                groups[key] = [i]
+            else:
+                members.append(i)
+        if not groups and not self._groups:
+            groups[()] = []
+
+        aggregates = [
+            (name, AGGREGATES[aggregate], self.table.column(column))
+            for name, (aggregate, column) in self._aggregates.items()
+        ]
+        records = []
+        for key, members in groups.items():
+            record = dict(zip(self._groups, key))
+            for name, aggregate, values in aggregates:
+                record[name] = aggregate([values[i] for i in members])
+            records.append(record)
+        return records
+
+    def _sorted(self, items, value_of):
+        """Sorts and limits ``items``, given ``value_of(item, column)``."""
+        if not self._order:
+            return items if self._limit is None else items[: self._limit]
+
+        wrap = _descending if self._descending else _ascending
+        order = self._order
+
+        def key(item):
+            return tuple(wrap(value_of(item, column)) for column in order)
+
+        if self._limit is not None:
+            pick = heapq.nlargest if self._descending else heapq.nsmallest
+            return pick(self._limit, items, key=key)
+        return sorted(items, key=key, reverse=self._descending)
+
+    def records(self):
+        """Runs the query.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`dict`
+        """
+        rows = self._row_ids()
+
+        if self._aggregates is not None:
+            records = self._sorted(
+                self._grouped(rows), lambda record, column: record[column]
+            )
+            if self._columns is not None:
+                records = [{c: r[c] for c in self._columns} for r in records]
+            return records
+
+        if self._order:
+            columns = {c: self.table.column(c) for c in self._order}
+            rows = self._sorted(list(rows), lambda i, column: columns[column][i])
+        elif self._limit is not None:
+            rows = rows[: self._limit]
+
+        return self.table._records_at(rows, self._columns)
+
+    def count(self):
+        """The number of rows the query returns."""
+        if self._aggregates is not None or self._limit is not None:
+            return len(self.records())
+        return len(self._row_ids())
+
+    def __iter__(self):
+        return iter(self.records())
+
+
+class Index:
+    """A hash index on one or more columns of a
+    :obj:`~client_code.model.proxies.DataTable`, for looking up rows by key.
+
+    Usually created with :obj:`~client_code.model.proxies.DataTable.index`, which
+    caches the index with the table. Keys are values of the column for an index on a
+    single column, and tuples of values for an index on several.
+
+    Example
+    -------
+    >>> orders = datasource.get_underlying_table(orders_id).index("Order ID")
+    >>> orders.lookup_many([mark["Order ID"] for mark in event.get_selected_marks()])
+    """
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+        values = [table.column(c) for c in columns]
+        keys = values[0] if len(values) == 1 else zip(*values)
+        positions = {}
+        for i, key in enumerate(keys):
+            rows = positions.get(key)
+            if rows is None:
+                positions[key] = [i]
+            else:
+                rows.append(i)
+        self._positions = positions
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def rows(self, key):
+        """The positions in the table of the rows with ``key``."""
+        return self._positions.get(key, [])
+
+    def lookup(self, key, columns=None):
+        """The records with ``key``, empty if there are none.
+
+        Parameters
+        ----------
+        key :
+            The value, or tuple of values, to look up.
+        columns : list
+            The columns to include in the records. All of them by default.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`dict`
+        """
+        return self.table._records_at(self.rows(key), columns)
+
+    def lookup_many(self, keys, columns=None):
+        """The records with any of ``keys``, in the order of the keys.
+
+        Keys that aren't in the index are skipped.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`dict`
+        """
+        positions = self._positions
+        rows = [i for key in keys for i in positions.get(key, ())]
+        return self.table._records_at(rows, columns)
+
+
+def join(tables, on, columns=None):
+    """Returns a generator of the records of the inner join of ``tables`` on the
+    columns ``on``.
+
+    Every table but the largest is indexed on ``on``, and the rows of the largest are
+    streamed past the indexes, so only the smaller tables' keys are held in memory.
+    Where tables share a column that isn't in ``on``, the value from the first of
+    them is kept.
+
+    Parameters
+    ----------
+    tables : list
+        The :obj:`~client_code.model.proxies.DataTable` objects to join.
+    on : list
+        The names of the columns to join on, present in every table.
+    columns : list
+        The columns to include in the records. All of them by default.
+
+    Raises
+    ------
+    KeyError
+        If a table is missing one of the ``on`` columns. This is checked before the
+        generator is returned.
+    """
+    for table in tables:
+        keys = table._column_keys()
+        for name in on:
+            if name not in keys:
+                raise KeyError(
+                    f"No column named '{name}' to join on. "
+                    f"Valid columns: {', '.join(keys)}"
+                )
+    return _join(tables, on, columns)
+
+
+def _join(tables, on, columns):
+    taken = set(on)
+    contributed = []
+    for table in tables:
+        names = [
+            name
+            for name in table._column_keys()
+            if name not in taken and (columns is None or name in columns)
+        ]
+        taken.update(names)
+        contributed.append([(name, table.column(name)) for name in names])
+    key_names = [name for name in on if columns is None or name in columns]
+
+    probe = max(range(len(tables)), key=lambda n: len(tables[n]._proxy.data))
+    indexes = [
+        None if n == probe else table.index(*on) for n, table in enumerate(tables)
+    ]
+    probe_values = [tables[probe].column(name) for name in on]
+    probe_keys = probe_values[0] if len(on) == 1 else zip(*probe_values)
+    single_key = len(on) == 1
+
+    for i, key in enumerate(probe_keys):
+        matches = [[i] if index is None else index.rows(key) for index in indexes]
+        if not all(matches):
+            continue
+        key_record = dict(zip(on, (key,) if single_key else key))
+        for rows in itertools.product(*matches):
+            record = {name: key_record[name] for name in key_names}
+            for row, table_columns in zip(rows, contributed):
+                for name, values in table_columns:
+                    record[name] = values[row]
+            yield record
@@ -0,0 +1,82 @@
+class Schema:
+    """The keys shared by every :obj:`Row` of a table, and their positions."""
+
+    __slots__ = ("keys", "positions")
+
+    def __init__(self, keys):
+        self.keys = tuple(keys)
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+
+    def row(self, values):
+        return Row(self, tuple(values))
+
+
+class Row:
+    """A read-only record that stores its values in a tuple, and shares its keys with
+    the other rows of its table.
+
+    Rows support the read-only parts of the :obj:`dict` interface, so they can be used
+    in place of the records from
+    :obj:`~client_code.model.proxies.DataTable.get_records`, and take a fraction of
+    their memory. ``dict(row)`` converts a row to a dict.
+
+    Example
+    -------
+    >>> rows = worksheet.get_summary_data(compact=True)
+    >>> rows[0]["Region"]
+    'West'
+    >>> dict(rows[0])
+    {'Region': 'West', 'SUM(Sales)': 725457.82}
+    """
+
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self, schema, values):
+        self._schema = schema
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._schema.positions[key]]
+
+    def get(self, key, default=None):
+        position = self._schema.positions.get(key)
+        return default if position is None else self._values[position]
+
+    def keys(self):
+        return list(self._schema.keys)
+
+    def values(self):
+        return list(self._values)
+
+    def items(self):
+        return list(zip(self._schema.keys, self._values))
+
+    def __iter__(self):
+        return iter(self._schema.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._schema.positions
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return dict(self.items()) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Row({dict(self.items())!r})"
+
+
+def compact(records):
+    """Converts a list of dicts to rows sharing one schema, the union of their keys.
+
+    Keys missing from a record are None in its row.
+    """
+    schema = Schema(dict.fromkeys(key for record in records for key in record))
+    return [schema.row(record.get(key) for key in schema.keys) for record in records]
@@ -0,0 +1,86 @@
+from .. import exceptions
+
+# The policies that can be passed to register_event_handler.
+policies = (None, "latest")
+
+
+class CancellationToken:
+    """Tells the work started for an event that a newer event has superseded it.
+
+    Handlers registered with ``policy="latest"`` receive events with a ``token``
+    attribute. Passing it to the data methods (e.g.
+    :obj:`~client_code.model.proxies.Worksheet.get_summary_data`) makes them stop
+    converting data, by raising :obj:`~client_code.exceptions.EventCancelled`, as soon as
+    a newer event arrives. The exception is caught by the scheduler, so handlers don't
+    need to handle it.
+
+    Example
+    -------
+    >>> def on_filter_changed(event):
+    ...     records = event.worksheet.get_summary_data(token=event.token)
+    ...     event.token.raise_if_cancelled()
+    ...     self.repeating_panel.items = records
+    >>> dashboard.register_event_handler('filter_changed', on_filter_changed, policy='latest')
+    """
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def raise_if_cancelled(self):
+        """Raises EventCancelled if the token has been cancelled."""
+        if self.cancelled:
+            raise exceptions.EventCancelled(
+                "A newer event has superseded the one being handled."
+            )
+
+
+class LatestWins:
+    """Calls ``handler`` for the latest event only.
+
+    An event arriving while the handler is still running for an earlier one cancels
+    the earlier run's token and is queued, replacing any event already queued. The
+    queued event is handled once the running call has returned, even if it raised an
+    error, which is raised again once the queue is empty.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self._running = None
+        self._pending = None
+
+    def __call__(self, event):
+        if self._running is not None:
+            self._running.cancel()
+            self._pending = event
+            return
+
+        error = None
+        while event is not None:
+            token = self._running = CancellationToken()
+            try:
+                self.handler(event._with_token(token))
+            except exceptions.EventCancelled:
+                pass
+            except Exception as e:
+                error = e
+            finally:
+                self._running = None
+            event, self._pending = self._pending, None
+        if error is not None:
+            raise error
+
+
+def scheduled(handler, policy):
+    """Returns ``handler`` wrapped to follow the scheduling ``policy``."""
+    if policy not in policies:
+        raise ValueError(
+            f"Unrecognized policy {policy}. Valid policies: {', '.join(map(str, policies))}"
+        )
+    if policy == "latest":
+        return LatestWins(handler)
+    return handler
@@ -0,0 +1,129 @@
+import bisect
+
+# Sorts after any character that can appear in a search string.
+_HIGHEST = "\U0010ffff"
+
+
+def _fold(value):
+    return str(value).lower()
+
+
+class SearchableDomain:
+    """A search index over a list of values, for building type-ahead pickers.
+
+    Values are matched case-insensitively on their string representation, and results
+    come back in alphabetical order, one page at a time. Prefix searches use a sorted
+    index and take O(log n) plus the size of the page. Substring searches use an index
+    of character n-grams, which is built on the first substring search.
+
+    Usually obtained from :obj:`~client_code.model.proxies.CategoricalFilter.get_searchable_domain`
+    or :obj:`~client_code.model.proxies.Parameter.searchable_values`, which cache the
+    index along with the domain it was built from.
+
+    Parameters
+    ----------
+    values : list
+        The values to search.
+    ngrams : bool
+        Whether substring searches should use an n-gram index. If False, they scan
+        every value instead, which saves the memory of the index.
+    ngram_size : int
+        The length of the n-grams.
+
+    Example
+    -------
+    >>> domain = SearchableDomain(['Anna Andrews', 'Bob Brown', 'Carla Banks'])
+    >>> domain.search('b')
+    {'values': ['Bob Brown'], 'total': 1, 'page': 0, 'page_size': 50}
+    >>> domain.search('an', mode='substring')['values']
+    ['Anna Andrews', 'Carla Banks']
+    """
+
+    def __init__(self, values, ngrams=True, ngram_size=3):
+        self.values = list(values)
+        self.ngrams = ngrams
+        self.ngram_size = ngram_size
+        keys = [_fold(v) for v in self.values]
+        self._order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._sorted_keys = [keys[i] for i in self._order]
+        self._grams = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def search(self, text, mode="prefix", page=0, page_size=50):
+        """Returns one page of the values matching ``text``.
+
+        Parameters
+        ----------
+        text : str
+            The text to search for. An empty string matches every value.
+        mode : 'prefix' or 'substring'
+            Whether values must start with ``text`` or just contain it.
+        page : int
+            The page of results to return, starting at 0.
+        page_size : int
+            The number of values per page.
+
+        Returns
+        -------
+        :obj:`dict` with keys ``values``, ``total``, ``page`` and ``page_size``.
+        """
+        text = _fold(text)
+        if mode == "prefix":
+            lo = bisect.bisect_left(self._sorted_keys, text)
+            hi = bisect.bisect_right(self._sorted_keys, text + _HIGHEST, lo)
+            ids = self._order[
+                lo + page * page_size : min(hi, lo + (page + 1) * page_size)
+            ]
+            total = hi - lo
+        elif mode == "substring":
+            matches = self._substring_matches(text)
+            total = len(matches)
+            ids = [
+                self._order[i]
+                for i in matches[page * page_size : (page + 1) * page_size]
+            ]
+        else:
+            raise ValueError(
+                f"Invalid search mode '{mode}'. Valid values: prefix, substring"
+            )
+        return {
+            "values": [self.values[i] for i in ids],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+        }
+
+    def _substring_matches(self, text):
+        """Positions, in sorted order, of the keys containing ``text``."""
+        keys = self._sorted_keys
+        if not text:
+            return list(range(len(keys)))
+        if not self.ngrams or len(text) < self.ngram_size:
+            return [i for i, key in enumerate(keys) if text in key]
+
+        if self._grams is None:
+            self._build_grams()
+        size = self.ngram_size
+        postings = []
+        for start in range(len(text) - size + 1):
+            posting = self._grams.get(text[start : start + size])
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return sorted(i for i in candidates if text in keys[i])
+
+    def _build_grams(self):
+        size = self.ngram_size
+        grams = {}
+        for i, key in enumerate(self._sorted_keys):
+            for gram in {key[s : s + size] for s in range(len(key) - size + 1)}:
+                posting = grams.get(gram)
+                if posting is None:
+                    grams[gram] = [i]
+                else:
+                    posting.append(i)
+        self._grams = grams
@@ -0,0 +1,327 @@
+import json
+import time
+
+import anvil.js
+
+from ._utils import _call_soon
+
+_DB_NAME = "trexjacket"
+_STORE_NAME = "tables"
+_INDEX_KEY = "__index__"
+
+# The default budget for cached tables, in (estimated) bytes.
+_DEFAULT_MAX_BYTES = 64 * 2**20
+
+# The estimated overhead of a stored cell, on top of its formatted value.
+_CELL_BYTES = 16
+
+
+def _await(executor):
+    """Runs ``executor(resolve, reject)`` in a JS Promise and returns its result."""
+    return anvil.js.await_promise(anvil.js.window.Promise(executor))
+
+
+class _MemoryBackend:
+    """Keeps entries for the lifetime of the page, when browser storage is missing."""
+
+    def __init__(self):
+        self._items = {}
+
+    def get(self, key):
+        return self._items.get(key)
+
+    def put(self, key, value):
+        self._items[key] = value
+
+    def delete(self, key):
+        self._items.pop(key, None)
+
+
+class _IndexedDBBackend:
+    """Keeps entries in an IndexedDB object store, so that they survive page loads."""
+
+    def __init__(self, indexed_db):
+        self._indexed_db = indexed_db
+        self._db = None
+
+    def _open(self):
+        if self._db is None:
+
+            def executor(resolve, reject):
+                request = self._indexed_db.open(_DB_NAME, 1)
+
+                def upgrade(event):
+                    request.result.createObjectStore(_STORE_NAME)
+
+                request.onupgradeneeded = upgrade
+                request.onsuccess = lambda event: resolve(request.result)
+                request.onerror = lambda event: reject(request.error)
+
+            self._db = _await(executor)
+        return self._db
+
+    def _request(self, mode, method, *args):
+        store = self._open().transaction(_STORE_NAME, mode).objectStore(_STORE_NAME)
+
+        def executor(resolve, reject):
+            request = getattr(store, method)(*args)
+            request.onsuccess = lambda event: resolve(request.result)
+            request.onerror = lambda event: reject(request.error)
+
+        return _await(executor)
+
+    def get(self, key):
+        return self._request("readonly", "get", key)
+
+    def put(self, key, value):
+        self._request("readwrite", "put", value, key)
+
+    def delete(self, key):
+        self._request("readwrite", "delete", key)
+
+
+def _default_backend():
+    indexed_db = getattr(anvil.js.window, "indexedDB", None)
+    if indexed_db is None:
+        return _MemoryBackend()
+    return _IndexedDBBackend(indexed_db)
+
+
+class _StoredColumn:
+    __slots__ = ("fieldName", "fieldId", "dataType", "index")
+
+    def __init__(self, field_name, field_id, data_type, index):
+        self.fieldName = field_name
+        self.fieldId = field_id
+        self.dataType = data_type
+        self.index = index
+
+
+class _StoredValue:
+    __slots__ = ("nativeValue", "formattedValue")
+
+    def __init__(self, native_value, formatted_value):
+        self.nativeValue = native_value
+        self.formattedValue = formatted_value
+
+    @property
+    def value(self):
+        return self.nativeValue
+
+
+class StoredTable:
+    """A table read back from the cache, with the attributes of a Tableau DataTable
+    that :obj:`~client_code.model.proxies.DataTable` uses.
+    """
+
+    def __init__(self, payload):
+        self.name = payload["name"]
+        self.isSummaryData = False
+        self.columns = [
+            _StoredColumn(name, field_id, data_type, i)
+            for i, (name, field_id, data_type) in enumerate(payload["columns"])
+        ]
+        width = len(self.columns)
+        self.data = [
+            [_StoredValue(row[i], row[i + 1]) for i in range(0, 2 * width, 2)]
+            for row in payload["rows"]
+        ]
+        self.totalRowCount = len(self.data)
+
+
+def _pack(table):
+    """Returns the storable payload for a Tableau DataTable, and its estimated size."""
+    columns = [[c.fieldName, c.fieldId, c.dataType] for c in table.columns]
+    rows = []
+    size = 0
+    for row in table.data:
+        packed = []
+        for data_value in row:
+            formatted = data_value.formattedValue
+            packed.append(data_value.nativeValue)
+            packed.append(formatted)
+            size += len(formatted or "") * 2 + _CELL_BYTES
+        rows.append(packed)
+    return {"name": table.name, "columns": columns, "rows": rows}, size
+
+
+class TableCache:
+    """A cache of logical tables in browser storage, which survives page loads.
+
+    Entries are keyed on the datasource id and logical table id, and record the
+    freshness token of the datasource at the time they were fetched: the time its
+    extract was last updated, and when it was last refreshed through
+    :obj:`~client_code.model.proxies.Datasource.refresh`. An entry whose token no
+    longer matches is stale, as are all the entries of live datasources, which have
+    no extract to date them. By default, stale entries are still returned, and the
+    table is fetched again in the background to replace them.
+
+    The tables are stored in IndexedDB, or in memory where it isn't available. When
+    the estimated size of the entries exceeds ``max_bytes``, the least recently used
+    are evicted.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The size budget for the cached tables.
+    backend : object
+        Where to keep entries, an object with ``get``, ``put`` and ``delete`` methods.
+        By default, IndexedDB if the browser has it.
+    """
+
+    def __init__(self, max_bytes=_DEFAULT_MAX_BYTES, backend=None):
+        self.max_bytes = max_bytes
+        self._backend = backend
+        self._index = None
+        self._index_saving = False
+        self._revalidating = set()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = _default_backend()
+        return self._backend
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                stored = self.backend.get(_INDEX_KEY)
+            except Exception as err:
+                print(
+                    f"Warning, browser storage is unavailable ({err}). "
+                    "Tables will only be cached until the page is reloaded."
+                )
+                self._backend = _MemoryBackend()
+                stored = None
+            if stored is None:
+                self._index = {"tables": {}, "refreshed": {}}
+            else:
+                self._index = json.loads(stored)
+        return self._index
+
+    def _save_index(self):
+        self.backend.put(_INDEX_KEY, json.dumps(self._index))
+
+    @staticmethod
+    def _key(datasource_id, table_id, options=None):
+        key = f"{datasource_id}/{table_id}"
+        if options:
+            key += "?" + json.dumps(options, sort_keys=True)
+        return key
+
+    def token(self, datasource):
+        """The freshness token for a Tableau datasource, or None for a live one, whose
+        entries are never fresh."""
+        extracted = getattr(datasource, "extractUpdateTime", None)
+        if extracted is None:
+            return None
+        refreshed = self._load_index()["refreshed"].get(datasource.id)
+        return f"{extracted}|{refreshed}"
+
+    def refreshed(self, datasource_id):
+        """Records that a datasource has been refreshed, which makes its tables stale.
+
+        Nothing is stored for a datasource without cached tables.
+        """
+        index = self._load_index()
+        prefix = self._key(datasource_id, "")
+        if not any(key.startswith(prefix) for key in index["tables"]):
+            return
+        index["refreshed"][datasource_id] = time.time()
+        self._save_index()
+
+    def get(self, datasource, table_id, fetch, revalidate=True, options=None):
+        """Returns a logical table of ``datasource``, from the cache if possible.
+
+        Parameters
+        ----------
+        datasource :
+            The Tableau datasource.
+        table_id : str
+            The id of the logical table.
+        fetch : function
+            Fetches the table from Tableau.
+        revalidate : bool
+            Whether to return a stale entry while the table is fetched in the
+            background. If False, stale entries are fetched before returning.
+        options : dict
+            The options ``fetch`` passes to Tableau, if any. Tables fetched with
+            different options are cached separately.
+
+        Returns
+        -------
+        A Tableau DataTable, or a :obj:`StoredTable`.
+        """
+        key = self._key(datasource.id, table_id, options)
+        token = self.token(datasource)
+        entry = self._load_index()["tables"].get(key)
+        fresh = entry is not None and token is not None and entry[2] == token
+        if fresh or (entry is not None and revalidate):
+            payload = self.backend.get(key)
+            if payload is not None:
+                self._touch(key)
+                if not fresh:
+                    self._revalidate(key, token, fetch)
+                return StoredTable(payload)
+
+        table = fetch()
+        self._put(key, token, table)
+        return table
+
+    def _revalidate(self, key, token, fetch):
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+
+        def run():
+            try:
+                self._put(key, token, fetch())
+            except Exception as err:
+                print(f"Warning, could not refresh the cached table {key}: {err}")
+            finally:
+                self._revalidating.discard(key)
+
+        _call_soon(run)
+
+    def _touch(self, key):
+        """Marks an entry as used. The index is saved once, soon after, however many
+        entries are read in the meantime."""
+        self._index["tables"][key][1] = time.time()
+        if not self._index_saving:
+            self._index_saving = True
+            _call_soon(self._save_touched)
+
+    def _save_touched(self):
+        self._index_saving = False
+        self._save_index()
+
+    def _put(self, key, token, table):
+        payload, size = _pack(table)
+        tables = self._load_index()["tables"]
+        if size > self.max_bytes:
+            return
+        tables.pop(key, None)
+        self._evict(self.max_bytes - size)
+        self.backend.put(key, payload)
+        tables[key] = [size, time.time(), token]
+        self._save_index()
+
+    def _evict(self, budget):
+        """Deletes the least recently used entries until they fit in ``budget``."""
+        tables = self._index["tables"]
+        used = sum(entry[0] for entry in tables.values())
+        for key in sorted(tables, key=lambda k: tables[k][1]):
+            if used <= budget:
+                break
+            used -= tables.pop(key)[0]
+            self.backend.delete(key)
+
+    def invalidate(self, datasource_id=None):
+        """Deletes the cached tables of a datasource, or of all datasources."""
+        tables = self._load_index()["tables"]
+        prefix = None if datasource_id is None else self._key(datasource_id, "")
+        for key in list(tables):
+            if prefix is None or key.startswith(prefix):
+                del tables[key]
+                self.backend.delete(key)
+        self._save_index()
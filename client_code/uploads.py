@@ -0,0 +1,182 @@
+import time
+
+import anvil.server
+
+from .model import export
+from .model._utils import _gather, clean_record_key, native_value_date_handler
+from .model.proxies import DataTable
+
+_START = "trexjacket_upload_start"
+_CHUNK = "trexjacket_upload_chunk"
+_FINISH = "trexjacket_upload_finish"
+
+# The estimated overhead of each value in a chunk, on top of its formatted length.
+_VALUE_BYTES = 8
+
+
+def _pages(source):
+    """The pages of a source, as Tableau DataTables, and its number of rows."""
+    if isinstance(source, DataTable):
+        return [source._proxy], len(source._proxy.data)
+    if hasattr(source, "getPageAsync"):
+        return export.iter_pages(source), source.totalRowCount
+    return [source], len(source.data)
+
+
+def _converter(column):
+    if column.dataType in ("date", "date-time"):
+        return lambda data_value: native_value_date_handler(data_value.nativeValue)
+    return lambda data_value: data_value.nativeValue
+
+
+class Uploader:
+    """Sends tables to server code in chunks, to stay within the limits of a single
+    server call.
+
+    Each chunk holds the values of consecutive rows, column by column, and is kept
+    under ``max_chunk_bytes`` (estimated from the formatted values). Up to
+    ``max_in_flight`` chunks are sent at once, and a failed chunk is retried up to
+    ``retries`` times. The server module ``uploads`` reassembles the columns.
+
+    Parameters
+    ----------
+    call : function
+        Makes a server call, with the signature of :obj:`anvil.server.call`, which is
+        the default. Pass a stand-in to run uploads without a server.
+    max_chunk_bytes : int
+        The estimated size limit of a chunk.
+    max_in_flight : int
+        The maximum number of chunks being sent at once.
+    retries : int
+        The number of times to retry a chunk before giving up.
+    retry_delay : float
+        Seconds to wait before retrying a chunk.
+    on_progress : function
+        Called with ``(rows_sent, total_rows)`` each time a chunk has been sent.
+
+    Example
+    -------
+    >>> # in server code
+    >>> from trexjacket import uploads
+    >>> @uploads.handler
+    ... def store_orders(columns):
+    ...     ...
+    >>> # in client code
+    >>> uploader = Uploader(on_progress=lambda sent, total: print(f"{sent}/{total}"))
+    >>> uploader.upload(datasource.get_underlying_table(), handler="store_orders")
+    """
+
+    def __init__(
+        self,
+        call=None,
+        max_chunk_bytes=512 * 1024,
+        max_in_flight=3,
+        retries=2,
+        retry_delay=0.5,
+        on_progress=None,
+    ):
+        self.call = call or anvil.server.call
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.on_progress = on_progress
+
+    def upload(self, source, handler=None):
+        """Sends a table to the server.
+
+        Parameters
+        ----------
+        source :
+            A :obj:`~client_code.model.proxies.DataTable`, a Tableau DataTable or a
+            Tableau DataTableReader, which is read a page at a time.
+        handler : str
+            The name of a server function, registered with ``uploads.handler``, to
+            call with the assembled columns, a :obj:`dict` of column name to
+            :obj:`list` of values.
+
+        Returns
+        -------
+        What the handler returns, or the upload id if there's no handler, which
+        server code can pass to ``uploads.assemble``.
+        """
+        pages, total = _pages(source)
+        # Kept per upload, so that uploads running at once report their own progress.
+        sent = [0]
+
+        def chunk_sent(row_count):
+            sent[0] += row_count
+            if self.on_progress is not None:
+                self.on_progress(sent[0], total)
+
+        chunk_count = 0
+        upload_id = None
+        for page in pages:
+            if upload_id is None:
+                columns = page.columns
+                upload_id = self.call(
+                    _START,
+                    [clean_record_key(c.fieldName) for c in columns],
+                    [c.dataType for c in columns],
+                )
+                converters = [_converter(c) for c in columns]
+            chunks = self._chunks(page, converters, chunk_count)
+            chunk_count += len(chunks)
+            self._send_all(upload_id, chunks, chunk_sent)
+
+        if upload_id is None:
+            upload_id = self.call(_START, [], [])
+        result = self.call(_FINISH, upload_id, chunk_count, handler)
+        return upload_id if handler is None else result
+
+    def _chunks(self, page, converters, first_index):
+        """Splits a page into (index, row count, columns) chunks."""
+        chunks = []
+        rows = []
+        size = 0
+
+        def close():
+            values = [
+                [convert(row[i]) for row in rows]
+                for i, convert in enumerate(converters)
+            ]
+            chunks.append((first_index + len(chunks), len(rows), values))
+
+        for row in page.data:
+            row_size = sum(
+                len(data_value.formattedValue or "") + _VALUE_BYTES
+                for data_value in row
+            )
+            if rows and size + row_size > self.max_chunk_bytes:
+                close()
+                rows = []
+                size = 0
+            rows.append(row)
+            size += row_size
+        if rows:
+            close()
+        return chunks
+
+    def _send_all(self, upload_id, chunks, chunk_sent):
+        """Sends chunks, with up to max_in_flight of them at once, and calls
+        ``chunk_sent`` with the row count of each one sent."""
+        pending = list(reversed(chunks))
+
+        def worker():
+            while pending:
+                chunk = pending.pop()
+                self._send(upload_id, chunk)
+                chunk_sent(chunk[1])
+
+        _gather([worker for _ in range(min(self.max_in_flight, len(chunks)))])
+
+    def _send(self, upload_id, chunk):
+        index, row_count, values = chunk
+        for attempt in range(self.retries + 1):
+            try:
+                self.call(_CHUNK, upload_id, index, values)
+                return
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.retry_delay)
@@ -0,0 +1,233 @@
+import datetime as dt
+import time
+
+import anvil.js
+import anvil.server
+
+from ._utils import _dejsonify, _jsonify
+
+# The default storage key, followed by ":" and the name of the server function.
+_STORAGE_KEY = "trexjacket_writeback"
+
+
+def _restore(value):
+    """Undoes the date encoding of _jsonify, at any depth."""
+    if isinstance(value, str):
+        if value.startswith("ISODate("):
+            return dt.date.fromisoformat(value[8:-1])
+        if value.startswith("ISODateTime("):
+            return dt.datetime.fromisoformat(value[12:-1])
+        return value
+    if isinstance(value, list):
+        return [_restore(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _restore(v) for k, v in value.items()}
+    return value
+
+
+def _hashable(key):
+    """Keys come back from storage with tuples turned into lists."""
+    if isinstance(key, list):
+        return tuple(_hashable(k) for k in key)
+    return key
+
+
+class _LocalStorage:
+    """The browser's localStorage, with the parts of the Settings interface in use."""
+
+    def __init__(self, local_storage):
+        self._local_storage = local_storage
+
+    def get(self, key, default=None):
+        value = _dejsonify(self._local_storage.getItem(key))
+        return default if value is None else value
+
+    def __setitem__(self, key, value):
+        self._local_storage.setItem(key, _jsonify(value))
+
+    def __delitem__(self, key):
+        self._local_storage.removeItem(key)
+
+
+def _default_storage():
+    local_storage = getattr(anvil.js.window, "localStorage", None)
+    return None if local_storage is None else _LocalStorage(local_storage)
+
+
+class WritebackQueue:
+    """Collects edits and writes them to the server in batches.
+
+    Edits are keyed, e.g. on the id of the row being overridden, and a newer edit of
+    a key replaces any older one that hasn't been sent. The queue is flushed
+    ``window`` seconds after the first edit following a flush, by calling
+    ``server_function`` with a list of ``[key, value]`` pairs, at most ``max_batch``
+    of them per call.
+
+    Edits are kept in ``storage`` until the call sending them has returned, and are
+    restored (and flushed) by the next queue using the same storage and key, e.g.
+    after the page is reloaded. If a flush fails, the queue tries again after a delay
+    that doubles with each failure in a row, up to ``max_retry_delay``.
+
+    Parameters
+    ----------
+    server_function : str
+        The name of the server function that writes a batch of edits.
+    window : float
+        Seconds to wait for more edits before flushing.
+    max_batch : int
+        The maximum number of edits per server call.
+    storage :
+        Where to keep unsent edits: an object with ``get``, item assignment and item
+        deletion, such as the dashboard's :obj:`~client_code.model.proxies.Settings`.
+        By default, the browser's localStorage. Note that every change to Settings is
+        saved to the workbook, which takes a call to Tableau, and is only possible in
+        authoring mode.
+    storage_key : str
+        The key to keep unsent edits under. By default,
+        ``"trexjacket_writeback:<server_function>"``, so that queues writing to
+        different functions don't restore each other's edits.
+    max_retry_delay : float
+        The longest wait, in seconds, before retrying a failed flush.
+    call : function
+        Makes the server call, with the signature of :obj:`anvil.server.call`, which
+        is the default.
+
+    Example
+    -------
+    >>> # in server code
+    >>> @anvil.server.callable
+    ... def save_overrides(entries):
+    ...     for (id_field, id_value), override in entries:
+    ...         app_tables.overrides.add_row(id_field=id_field, id_value=id_value, **override)
+    >>> # in client code
+    >>> self.overrides = WritebackQueue("save_overrides")
+    >>> self.overrides.put((id_field, id_value), {"override_value": value, "comment": comment})
+    """
+
+    def __init__(
+        self,
+        server_function,
+        window=1.0,
+        max_batch=500,
+        storage=None,
+        storage_key=None,
+        max_retry_delay=60.0,
+        call=None,
+    ):
+        self.server_function = server_function
+        self.window = window
+        self.max_batch = max_batch
+        self.storage = storage if storage is not None else _default_storage()
+        if storage_key is None:
+            storage_key = f"{_STORAGE_KEY}:{server_function}"
+        self.storage_key = storage_key
+        self.max_retry_delay = max_retry_delay
+        self.call = call or anvil.server.call
+        self._pending = {}
+        # The edits of the running flush that haven't been sent yet, if any.
+        self._in_flight = None
+        self._timer = None
+        self._latencies = []
+        self._flushed = 0
+        self._failures = 0
+        self._failures_in_a_row = 0
+
+        if self.storage is not None:
+            stored = self.storage.get(storage_key) or []
+            for key, value in stored:
+                self._pending[_hashable(_restore(key))] = _restore(value)
+        if self._pending:
+            self._schedule()
+
+    @property
+    def pending(self):
+        """The edits that haven't been sent, keyed on their keys."""
+        return dict(self._pending)
+
+    def put(self, key, value):
+        """Queues an edit, replacing any unsent edit of ``key``."""
+        self._pending.pop(key, None)
+        self._pending[key] = value
+        self._persist()
+        self._schedule()
+
+    def _schedule(self, delay=None):
+        if self._timer is None:
+            self._timer = anvil.js.window.setTimeout(
+                anvil.js.report_exceptions(self._on_timer),
+                (self.window if delay is None else delay) * 1000,
+            )
+
+    def _on_timer(self):
+        self._timer = None
+        self.flush()
+
+    def _persist(self):
+        """Stores the edits being sent, followed by the newer ones still queued."""
+        if self.storage is None:
+            return
+        entries = list((self._in_flight or {}).items()) + list(self._pending.items())
+        if entries:
+            self.storage[self.storage_key] = [[key, value] for key, value in entries]
+        else:
+            del self.storage[self.storage_key]
+
+    def flush(self):
+        """Sends every queued edit now.
+
+        If a call fails, the edits that weren't sent are queued again, unless newer
+        edits of their keys have been queued since, a retry is scheduled, and the
+        error is raised. If another flush is running, the edits are left for the next
+        one.
+        """
+        if self._in_flight is not None:
+            self._schedule()
+            return
+        entries = list(self._pending.items())
+        self._pending = {}
+        self._in_flight = dict(entries)
+        for start in range(0, len(entries), self.max_batch):
+            batch = entries[start : start + self.max_batch]
+            started = time.time()
+            try:
+                self.call(self.server_function, [list(entry) for entry in batch])
+            except Exception:
+                unsent = self._in_flight
+                unsent.update(self._pending)
+                self._pending = unsent
+                self._in_flight = None
+                self._persist()
+                self._failures += 1
+                self._failures_in_a_row += 1
+                self._schedule(
+                    min(
+                        self.window * 2**self._failures_in_a_row,
+                        self.max_retry_delay,
+                    )
+                )
+                raise
+            self._latencies.append(time.time() - started)
+            self._flushed += len(batch)
+            for key, _ in batch:
+                del self._in_flight[key]
+            self._persist()
+        self._in_flight = None
+        self._failures_in_a_row = 0
+
+    @property
+    def stats(self):
+        """The number of edits and server calls sent so far, the number of calls that
+        failed, and the latency of the calls in seconds.
+
+        :obj:`dict` with keys ``edits``, ``calls``, ``failures``, ``last_latency``,
+        ``mean_latency`` and ``max_latency``
+        """
+        latencies = self._latencies
+        return {
+            "edits": self._flushed,
+            "calls": len(latencies),
+            "failures": self._failures,
+            "last_latency": latencies[-1] if latencies else None,
+            "mean_latency": sum(latencies) / len(latencies) if latencies else None,
+            "max_latency": max(latencies) if latencies else None,
+        }
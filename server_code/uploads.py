@@ -0,0 +1,168 @@
+"""Reassembles tables sent in chunks by :obj:`client_code.uploads.Uploader`.
+
+Each chunk is kept in its own row of the ``trexjacket_uploads`` table until the upload
+finishes, so chunks sent at the same time don't contend with each other, and they
+don't add to the size of the server session. Upload ids are made by the server, and
+an upload can only be added to and finished from the session that started it.
+
+When the upload finishes, the client can name a handler, registered with
+:obj:`handler`, which is called with the columns once every chunk has arrived.
+Otherwise, server code reads the columns itself with :obj:`assemble`. The rows of
+uploads that are never assembled are deleted once they are older than :obj:`EXPIRY`.
+"""
+import datetime as dt
+import pickle
+import secrets
+
+import anvil
+import anvil.server
+import anvil.tables.query as q
+from anvil.tables import app_tables
+
+#: How long the chunks of an upload are kept if it isn't assembled.
+EXPIRY = dt.timedelta(hours=24)
+
+# The chunk number of the row holding an upload's column names and types.
+_HEADER = -1
+
+# The session key of the token identifying the session's uploads.
+_OWNER_KEY = "trexjacket_upload_owner"
+
+# Upload handlers, keyed on name.
+_handlers = {}
+
+
+def handler(fn):
+    """Registers ``fn`` as an upload handler, under its name.
+
+    The client can only name registered handlers, rather than any server function.
+
+    Example
+    -------
+    >>> from trexjacket import uploads
+    >>> @uploads.handler
+    ... def store_orders(columns):
+    ...     ...
+    """
+    _handlers[fn.__name__] = fn
+    return fn
+
+
+def _pack(value):
+    return anvil.BlobMedia("application/octet-stream", pickle.dumps(value))
+
+
+def _unpack(media):
+    return pickle.loads(media.get_bytes())
+
+
+def _now():
+    return dt.datetime.now(dt.timezone.utc)
+
+
+def _owner():
+    """The token of the current session, made on its first upload."""
+    owner = anvil.server.session.get(_OWNER_KEY)
+    if owner is None:
+        owner = anvil.server.session[_OWNER_KEY] = secrets.token_hex(16)
+    return owner
+
+
+def _header(upload_id, owner=None):
+    """The column names and types of an upload, if it belongs to ``owner``, when
+    given."""
+    for row in app_tables.trexjacket_uploads.search(upload_id=upload_id, chunk=_HEADER):
+        if owner is None or row["owner"] == owner:
+            return _unpack(row["data"])
+    raise KeyError(f"No upload with id {upload_id}")
+
+
+def _store(upload_id, chunk, value, owner):
+    app_tables.trexjacket_uploads.add_row(
+        upload_id=upload_id,
+        chunk=chunk,
+        data=_pack(value),
+        owner=owner,
+        created=_now(),
+    )
+
+
+def expire():
+    """Deletes the rows of uploads older than :obj:`EXPIRY`. Called whenever an upload
+    starts."""
+    for row in app_tables.trexjacket_uploads.search(
+        created=q.less_than(_now() - EXPIRY)
+    ):
+        row.delete()
+
+
+@anvil.server.callable
+def trexjacket_upload_start(names, types):
+    """Starts an upload of a table with columns ``names`` of Tableau ``types``, and
+    returns its id."""
+    expire()
+    upload_id = secrets.token_hex(16)
+    _store(upload_id, _HEADER, {"names": names, "types": types}, _owner())
+    return upload_id
+
+
+@anvil.server.callable
+def trexjacket_upload_chunk(upload_id, index, columns):
+    """Stores chunk number ``index``: a list of values for each column.
+
+    Sending the same chunk again replaces it, so failed calls can be retried.
+    """
+    owner = _owner()
+    _header(upload_id, owner)
+    for row in app_tables.trexjacket_uploads.search(upload_id=upload_id, chunk=index):
+        row.delete()
+    _store(upload_id, index, columns, owner)
+
+
+@anvil.server.callable
+def trexjacket_upload_finish(upload_id, chunk_count, handler=None):
+    """Checks that every chunk has arrived, and calls the handler registered under
+    the name ``handler``, if given, with the assembled columns. Returns what the
+    handler returns.
+
+    Without a handler, the chunks are kept until :obj:`assemble` is called, or they
+    expire.
+    """
+    if handler is not None and handler not in _handlers:
+        raise KeyError(f"No upload handler named {handler}")
+    _header(upload_id, _owner())
+    arrived = {
+        row["chunk"]
+        for row in app_tables.trexjacket_uploads.search(upload_id=upload_id)
+    }
+    missing = [i for i in range(chunk_count) if i not in arrived]
+    if missing:
+        raise ValueError(
+            f"Upload {upload_id} is missing chunks {', '.join(map(str, missing))}"
+        )
+    if handler is not None:
+        return _handlers[handler](assemble(upload_id))
+
+
+def assemble(upload_id):
+    """Returns the columns of an upload, and deletes its rows.
+
+    Returns
+    -------
+    :obj:`dict` of column name to :obj:`list` of values
+
+    Raises
+    ------
+    KeyError
+        If there is no such upload, or it has expired.
+    """
+    names = _header(upload_id)["names"]
+    rows = list(app_tables.trexjacket_uploads.search(upload_id=upload_id))
+    chunks = {row["chunk"]: row for row in rows if row["chunk"] != _HEADER}
+    columns = {name: [] for name in names}
+    for index in sorted(chunks):
+        for values, name in zip(_unpack(chunks[index]["data"]), names):
+            columns[name].extend(values)
+    for row in rows:
+        row.delete()
+    return columns
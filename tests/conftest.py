@@ -0,0 +1,18 @@
+"""Runs the tests against the fake Tableau host from ``benchmarks.mock_tableau``.
+
+Each test gets a fresh host and session. The library is importable as
+``trexjacket`` once the ``host`` fixture has run, so tests import it inside the test.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import mock_tableau  # noqa: E402
+
+
+@pytest.fixture
+def host():
+    return mock_tableau.install()
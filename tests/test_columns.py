@@ -0,0 +1,64 @@
+from benchmarks import mock_tableau
+
+COLUMNS = [("Region", "string"), ("Quantity", "int"), ("Sales", "float")]
+ROWS = [
+    ["West", 1, 1.5],
+    ["East", None, 2.5],
+    ["West", 3, None],
+    ["North", 4, 4.5],
+]
+
+
+def _table():
+    from trexjacket.model.proxies import DataTable
+
+    return DataTable(mock_tableau.DataTable(COLUMNS, ROWS))
+
+
+def test_columns_round_trip(host):
+    from trexjacket.model.columns import NumericColumn
+
+    table = _table()
+    columns = table.get_columns()
+
+    assert list(columns) == ["Region", "Quantity", "Sales"]
+    assert columns["Region"] == ["West", "East", "West", "North"]
+    assert isinstance(columns["Quantity"], NumericColumn)
+    assert columns["Quantity"].data.typecode == "q"
+    assert columns["Sales"].data.typecode == "d"
+    for name in ("Quantity", "Sales"):
+        assert columns[name].to_list() == table.column(name)
+        assert list(columns[name]) == table.column(name)
+    assert table.get_columns("Sales")["Sales"] is columns["Sales"]
+
+
+def test_numeric_column_indexing(host):
+    sales = _table().get_columns("Sales")["Sales"]
+
+    assert len(sales) == 4
+    assert sales[0] == 1.5
+    assert sales[2] is None
+    assert sales[-1] == 4.5
+    assert sales[-2] is None
+    assert sales[1:3] == [2.5, None]
+    assert sales[::-1] == [4.5, None, 2.5, 1.5]
+    assert sales[10:] == []
+
+
+def test_numeric_column_without_nulls(host):
+    from trexjacket.model.columns import NumericColumn
+
+    column = NumericColumn("Quantity", "int", [1, 2, 3])
+
+    assert column.nulls is None
+    assert column[:] == column.to_list() == [1, 2, 3]
+
+
+def test_numeric_column_falls_back_to_a_list(host):
+    from trexjacket.model.columns import NumericColumn
+
+    column = NumericColumn("Quantity", "int", [1, 2**70, None])
+
+    assert isinstance(column.data, list)
+    assert column.to_list() == [1, 2**70, None]
+    assert column[1:] == [2**70, None]
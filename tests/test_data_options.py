@@ -0,0 +1,65 @@
+import pytest
+
+from benchmarks import mock_tableau, synthetic
+
+
+def _columns():
+    return synthetic.make_table(1).columns
+
+
+def test_data_options(host):
+    from trexjacket.model.proxies import _data_options
+
+    options = _data_options(
+        _columns,
+        columns=["Order ID", "SUM(Measure 0)"],
+        max_rows=10,
+        ignore_aliases=True,
+        include_data_values="only-native-values",
+    )
+
+    assert options == {
+        "columnsToIncludeById": ["[Order ID]", "[SUM(Measure 0)]"],
+        "maxRows": 10,
+        "ignoreAliases": True,
+        "includeDataValuesOption": "only-native-values",
+    }
+
+
+def test_no_options_and_no_column_lookup(host):
+    from trexjacket.model.proxies import _data_options
+
+    def column_info():
+        raise AssertionError("columns were looked up")
+
+    assert _data_options(column_info) == {}
+
+
+def test_unknown_columns_and_formatted_values_are_rejected(host):
+    from trexjacket.model.proxies import _data_options
+
+    with pytest.raises(KeyError):
+        _data_options(_columns, columns=["Profit"])
+    with pytest.raises(ValueError):
+        _data_options(_columns, include_data_values="only-formatted-values")
+
+
+def test_underlying_data_is_pushed_down(host):
+    orders = synthetic.make_table(50)
+    datasource = mock_tableau.Datasource(host, "Orders", {"Orders_1": orders})
+    host.dashboard.add_worksheet(
+        "Sales", underlying={"Orders_1": orders}, datasources=[datasource]
+    )
+    from trexjacket import api
+
+    worksheet = api.get_dashboard().get_worksheet("Sales")
+    (ds,) = worksheet.datasources
+
+    for source in (worksheet, ds):
+        records = source.get_underlying_data(
+            columns=["Region", "Order ID"],
+            max_rows=5,
+            include_data_values="only-native-values",
+        )
+        assert len(records) == 5
+        assert list(records[0]) == ["Order ID", "Region"]
@@ -0,0 +1,99 @@
+from benchmarks import mock_tableau
+
+COLUMNS = [("YEAR(Order Date)", "int"), ("Region", "string"), ("SUM(Sales)", "float")]
+
+
+def _summary(rows):
+    return mock_tableau.DataTable(COLUMNS, rows, is_summary=True)
+
+
+def test_is_measure_column(host):
+    from trexjacket.model.diff import is_measure_column
+
+    assert is_measure_column("SUM(Sales)")
+    assert is_measure_column("AGG(Profit Ratio)")
+    assert is_measure_column("Measure Values")
+    assert not is_measure_column("Region")
+    assert not is_measure_column("YEAR(Order Date)")
+    assert not is_measure_column("MDY(Order Date)")
+
+
+def test_summary_changes(host):
+    sheet = host.dashboard.add_worksheet(
+        "Sales",
+        summary=_summary(
+            [[2020, "West", 10.0], [2021, "West", 20.0], [2021, "East", 5.0]]
+        ),
+    )
+    from trexjacket import api
+
+    worksheet = api.get_dashboard().get_worksheet("Sales")
+    first = worksheet.get_summary_changes()
+    assert len(first["inserted"]) == 3
+    assert first["updated"] == first["deleted"] == []
+
+    sheet.summary = _summary(
+        [[2021, "West", 25.0], [2021, "East", 5.0], [2022, "East", 1.0]]
+    )
+    changes = worksheet.get_summary_changes()
+
+    assert changes["deleted"] == [
+        {"YEAR(Order Date)": 2020, "Region": "West", "SUM(Sales)": 10.0}
+    ]
+    assert changes["updated"] == [
+        {"YEAR(Order Date)": 2021, "Region": "West", "SUM(Sales)": 25.0}
+    ]
+    assert changes["inserted"] == [
+        {"YEAR(Order Date)": 2022, "Region": "East", "SUM(Sales)": 1.0}
+    ]
+
+
+def test_filtering_out_a_year_only_deletes_its_row(host):
+    from trexjacket.model.diff import SummarySnapshot
+
+    snapshot = SummarySnapshot()
+    snapshot.update(
+        [
+            {"YEAR(Order Date)": 2020, "SUM(Sales)": 10.0},
+            {"YEAR(Order Date)": 2021, "SUM(Sales)": 20.0},
+        ]
+    )
+    changes = snapshot.update([{"YEAR(Order Date)": 2021, "SUM(Sales)": 20.0}])
+
+    assert changes == {
+        "inserted": [],
+        "deleted": [{"YEAR(Order Date)": 2020, "SUM(Sales)": 10.0}],
+        "updated": [],
+    }
+
+
+def test_rows_with_equal_keys_are_told_apart_by_order(host):
+    from trexjacket.model.diff import SummarySnapshot
+
+    snapshot = SummarySnapshot()
+    snapshot.update([{"SUM(Sales)": 1.0}, {"SUM(Sales)": 2.0}])
+    changes = snapshot.update([{"SUM(Sales)": 1.0}])
+
+    assert changes["deleted"] == [{"SUM(Sales)": 2.0}]
+    assert changes["updated"] == changes["inserted"] == []
+
+
+def test_changing_options_starts_a_new_snapshot(host):
+    host.dashboard.add_worksheet(
+        "Sales", summary=_summary([[2020, "West", 10.0], [2021, "West", 20.0]])
+    )
+    from trexjacket import api
+
+    worksheet = api.get_dashboard().get_worksheet("Sales")
+    worksheet.get_summary_changes(key_columns=["Region"])
+
+    # Back to the default key columns: the old snapshot was keyed on Region alone.
+    changes = worksheet.get_summary_changes()
+    assert len(changes["inserted"]) == 2
+    assert changes["deleted"] == changes["updated"] == []
+
+    changes = worksheet.get_summary_changes(collapse_measures=True)
+    assert len(changes["inserted"]) == 2
+
+    changes = worksheet.get_summary_changes(collapse_measures=True)
+    assert changes == {"inserted": [], "deleted": [], "updated": []}
@@ -0,0 +1,142 @@
+def _dashboard_with_two_worksheets(host):
+    for name in ("A", "B"):
+        host.dashboard.add_worksheet(name)
+    from trexjacket import api
+
+    return api.get_dashboard()
+
+
+def _fire_filter_change(host, field_name):
+    for worksheet in host.dashboard.worksheets:
+        worksheet.fire("filter-changed", fieldName=field_name, worksheet=worksheet)
+
+
+def test_dashboard_filter_handler_sees_each_change_once(host):
+    dashboard = _dashboard_with_two_worksheets(host)
+    seen = []
+    dashboard.register_event_handler(
+        "filter_changed", lambda event: seen.append(event.fieldName)
+    )
+
+    _fire_filter_change(host, "Region")
+
+    assert seen == ["Region"]
+
+
+def test_duplicate_suppression_is_per_handler(host):
+    dashboard = _dashboard_with_two_worksheets(host)
+    first, second = [], []
+    dashboard.register_event_handler(
+        "filter_changed", lambda event: first.append(event.fieldName)
+    )
+    dashboard.register_event_handler(
+        "filter_changed", lambda event: second.append(event.fieldName)
+    )
+
+    _fire_filter_change(host, "Region")
+
+    assert first == second == ["Region"]
+
+
+def test_different_fields_are_not_duplicates(host):
+    dashboard = _dashboard_with_two_worksheets(host)
+    seen = []
+    dashboard.register_event_handler(
+        "filter_changed", lambda event: seen.append(event.fieldName)
+    )
+
+    _fire_filter_change(host, "Region")
+    _fire_filter_change(host, "Segment")
+
+    assert seen == ["Region", "Segment"]
+
+
+class _Form:
+    def __init__(self):
+        self.seen = []
+
+    def on_selection(self, event):
+        self.seen.append(event)
+
+
+def test_unregistered_handlers_are_forgotten(host):
+    dashboard = _dashboard_with_two_worksheets(host)
+    from trexjacket.model.proxies import _Tableau
+
+    session = _Tableau.session()
+    forms = [_Form() for _ in range(100)]
+    for form in forms:
+        dashboard.register_event_handler(
+            "selection_changed", form.on_selection, policy="latest"
+        )
+    assert len(session._schedulers) == 100
+
+    dashboard.unregister_all_event_handlers()
+
+    assert session._schedulers == {}
+    assert session._handler_index == {}
+    assert session.callbacks == {}
+
+
+def test_handler_registered_again_starts_afresh(host):
+    dashboard = _dashboard_with_two_worksheets(host)
+    from trexjacket.model import events
+    from trexjacket.model.proxies import _Tableau
+
+    session = _Tableau.session()
+    form = _Form()
+    worksheet = dashboard.get_worksheet("A")
+    worksheet.register_event_handler(
+        "selection_changed", form.on_selection, policy="latest"
+    )
+    first = session._schedulers[(form.on_selection, events.SELECTION_CHANGED, "latest")]
+
+    worksheet.unregister_event_handler(form.on_selection)
+    assert session._schedulers == {}
+    worksheet.register_event_handler(
+        "selection_changed", form.on_selection, policy="latest"
+    )
+
+    assert (
+        session._schedulers[(form.on_selection, events.SELECTION_CHANGED, "latest")]
+        is not first
+    )
+    host.dashboard.worksheets[0].fire("mark-selection-changed")
+    assert len(form.seen) == 1
+
+
+def test_changing_policy_forgets_the_old_scheduler(host):
+    dashboard = _dashboard_with_two_worksheets(host)
+    from trexjacket.model import events
+    from trexjacket.model.proxies import _Tableau
+
+    session = _Tableau.session()
+    form = _Form()
+    dashboard.register_event_handler("selection_changed", form.on_selection)
+    dashboard.register_event_handler(
+        "selection_changed", form.on_selection, policy="latest"
+    )
+
+    assert list(session._schedulers) == [
+        (form.on_selection, events.SELECTION_CHANGED, "latest")
+    ]
+
+
+def test_rebound_filter_handler_sees_changes_once(host):
+    dashboard = _dashboard_with_two_worksheets(host)
+    from trexjacket.model.proxies import _Tableau
+
+    session = _Tableau.session()
+    form = _Form()
+    dashboard.register_event_handler("filter_changed", form.on_selection)
+    _fire_filter_change(host, "Region")
+
+    dashboard.unregister_all_event_handlers()
+    assert session._schedulers == {}
+    assert all(w.listener_count() == 0 for w in host.dashboard.worksheets)
+
+    dashboard.register_event_handler("filter_changed", form.on_selection)
+    _fire_filter_change(host, "Region")
+
+    assert [event.fieldName for event in form.seen] == ["Region", "Region"]
+    assert all(w.listener_count() == 1 for w in host.dashboard.worksheets)
@@ -0,0 +1,29 @@
+from benchmarks import mock_tableau
+
+COLUMNS = [("Region", "string"), ("SUM(Sales)", "float")]
+
+
+def _worksheet(host, rows):
+    summary = mock_tableau.DataTable(COLUMNS, rows, is_summary=True)
+    host.dashboard.add_worksheet("Sales", summary=summary)
+    from trexjacket import api
+
+    return api.get_dashboard().get_worksheet("Sales")
+
+
+def test_export_csv(host):
+    worksheet = _worksheet(host, [["West", 1.5], ['Say "hi", West', None]])
+
+    media = worksheet.export_csv(summary=True, page_size=1)
+
+    assert media.get_bytes() == (
+        b'Region,SUM(Sales)\r\nWest,1.5\r\n"Say ""hi"", West",\r\n'
+    )
+
+
+def test_export_csv_of_empty_table_has_header(host):
+    worksheet = _worksheet(host, [])
+
+    media = worksheet.export_csv(summary=True)
+
+    assert media.get_bytes() == b"Region,SUM(Sales)\r\n"
@@ -0,0 +1,56 @@
+DOMAIN = [f"Customer {i:03d}" for i in range(200)]
+
+
+def _filter(host, applied):
+    sheet = host.dashboard.add_worksheet("Sales")
+    sheet.add_categorical_filter("Customer", DOMAIN, applied)
+    calls = []
+    apply = sheet.applyFilterAsync
+
+    def recording_apply(field_name, values, update_type):
+        calls.append((update_type, len(values)))
+        return apply(field_name, values, update_type)
+
+    sheet.applyFilterAsync = recording_apply
+    from trexjacket import api
+
+    worksheet = api.get_dashboard().get_worksheet("Sales")
+    return worksheet.get_filter("Customer"), calls
+
+
+def test_small_changes_are_sent_as_deltas(host):
+    customer, calls = _filter(host, DOMAIN[:100])
+
+    customer.applied_values = DOMAIN[1:101]
+
+    assert calls == [("add", 1), ("remove", 1)]
+    assert customer.applied_values == DOMAIN[1:101]
+
+
+def test_large_changes_replace_the_values(host):
+    customer, calls = _filter(host, DOMAIN[:100])
+
+    customer.applied_values = DOMAIN[100:110]
+
+    assert calls == [("replace", 10)]
+    assert customer.applied_values == DOMAIN[100:110]
+
+
+def test_all_selected_filters_are_replaced(host):
+    customer, calls = _filter(host, DOMAIN)
+
+    customer.applied_values = DOMAIN[:150]
+
+    assert calls == [("replace", 150)]
+
+
+def test_values_are_sent_in_chunks(host, monkeypatch):
+    from trexjacket.model import proxies
+
+    monkeypatch.setattr(proxies, "_FILTER_CHUNK_SIZE", 4)
+    customer, calls = _filter(host, DOMAIN[:100])
+
+    customer.applied_values = DOMAIN[100:110]
+
+    assert calls == [("replace", 4), ("add", 4), ("add", 2)]
+    assert customer.applied_values == DOMAIN[100:110]
@@ -0,0 +1,12 @@
+import sys
+
+OPTIONAL = ("columns", "diff", "export", "query", "rows", "search", "storage")
+
+
+def test_optional_modules_are_loaded_on_first_use(host):
+    from trexjacket import api
+
+    api.get_dashboard()
+
+    loaded = [name for name in OPTIONAL if f"trexjacket.model.{name}" in sys.modules]
+    assert loaded == []
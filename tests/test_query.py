@@ -0,0 +1,262 @@
+import pytest
+
+from benchmarks import mock_tableau
+
+ORDERS = (
+    [("Order ID", "string"), ("Region", "string"), ("Sales", "float")],
+    [
+        ["A", "West", 10.0],
+        ["B", "West", None],
+        ["C", "East", 5.0],
+        ["D", None, 7.0],
+        ["E", "East", 20.0],
+        ["F", "West", 1.0],
+    ],
+)
+
+
+def _table(columns, rows):
+    from trexjacket.model.proxies import DataTable
+
+    return DataTable(mock_tableau.DataTable(columns, rows))
+
+
+def test_where_select_and_order(host):
+    table = _table(*ORDERS)
+
+    records = (
+        table.query()
+        .where("Region", "West")
+        .order_by("Sales")
+        .select("Order ID", "Sales")
+        .records()
+    )
+
+    assert records == [
+        {"Order ID": "F", "Sales": 1.0},
+        {"Order ID": "A", "Sales": 10.0},
+        {"Order ID": "B", "Sales": None},
+    ]
+
+
+def test_where_with_a_test_function(host):
+    table = _table(*ORDERS)
+
+    query = table.query().where("Sales", lambda v: v is not None and v > 6)
+
+    assert [r["Order ID"] for r in query] == ["A", "D", "E"]
+    assert query.count() == 3
+
+
+def test_group_by_and_agg_skip_none(host):
+    table = _table(*ORDERS)
+
+    records = (
+        table.query()
+        .group_by("Region")
+        .agg(
+            total=("sum", "Sales"),
+            mean=("mean", "Sales"),
+            sales=("count", "Sales"),
+            orders=("distinct", "Order ID"),
+            low=("min", "Sales"),
+            high=("max", "Sales"),
+        )
+        .order_by("Region")
+        .records()
+    )
+
+    assert records == [
+        {
+            "Region": "East",
+            "total": 25.0,
+            "mean": 12.5,
+            "sales": 2,
+            "orders": 2,
+            "low": 5.0,
+            "high": 20.0,
+        },
+        {
+            "Region": "West",
+            "total": 11.0,
+            "mean": 5.5,
+            "sales": 2,
+            "orders": 3,
+            "low": 1.0,
+            "high": 10.0,
+        },
+        {
+            "Region": None,
+            "total": 7.0,
+            "mean": 7.0,
+            "sales": 1,
+            "orders": 1,
+            "low": 7.0,
+            "high": 7.0,
+        },
+    ]
+
+
+def test_aggregates_of_only_none(host):
+    table = _table(*ORDERS)
+
+    (record,) = (
+        table.query()
+        .where("Order ID", "B")
+        .agg(
+            total=("sum", "Sales"),
+            mean=("mean", "Sales"),
+            values=("distinct", "Sales"),
+            high=("max", "Sales"),
+        )
+        .records()
+    )
+
+    assert record == {"total": 0, "mean": None, "values": 0, "high": None}
+
+
+def test_agg_without_rows(host):
+    table = _table(*ORDERS)
+
+    records = table.query().where("Region", "North").agg(n=("count", "Sales"))
+
+    assert records.records() == [{"n": 0}]
+
+
+def test_top_puts_none_last(host):
+    table = _table(*ORDERS)
+
+    top = table.query().top(3, "Sales").select("Order ID").records()
+    bottom = table.query().top(2, "Sales", descending=False).records()
+
+    assert top == [{"Order ID": "E"}, {"Order ID": "A"}, {"Order ID": "D"}]
+    assert [r["Order ID"] for r in bottom] == ["F", "C"]
+    assert table.query().top(6, "Sales").records()[-1]["Order ID"] == "B"
+
+
+def test_top_groups(host):
+    table = _table(*ORDERS)
+
+    records = (
+        table.query().group_by("Region").agg(total=("sum", "Sales")).top(1, "total")
+    )
+
+    assert records.records() == [{"Region": "East", "total": 25.0}]
+
+
+def test_unknown_aggregate_and_column(host):
+    table = _table(*ORDERS)
+
+    with pytest.raises(ValueError):
+        table.query().agg(total=("median", "Sales"))
+    with pytest.raises(KeyError):
+        table.query().where("Profit", 1).records()
+
+
+def test_index_lookups(host):
+    table = _table(*ORDERS)
+
+    by_region = table.index("Region")
+    by_both = table.index("Region", "Order ID")
+
+    assert table.index("Region") is by_region
+    assert [r["Order ID"] for r in by_region.lookup("West")] == ["A", "B", "F"]
+    assert by_region.lookup("North") == []
+    assert None in by_region
+    assert len(by_region) == 3
+    assert by_both.lookup(("East", "E"), columns=["Sales"]) == [{"Sales": 20.0}]
+    assert [r["Order ID"] for r in by_region.lookup_many(["East", "North", None])] == [
+        "C",
+        "E",
+        "D",
+    ]
+
+
+def test_index_needs_a_column(host):
+    with pytest.raises(ValueError):
+        _table(*ORDERS).index()
+
+
+def _lines():
+    return _table(
+        [("Order ID", "string"), ("Line", "int"), ("Product", "string")],
+        [["A", 1, "Chair"], ["A", 2, "Desk"], ["C", 1, "Lamp"], ["Z", 1, "Pen"]],
+    )
+
+
+def _returns():
+    return _table(
+        [("Order ID", "string"), ("Line", "int"), ("Reason", "string")],
+        [["A", 2, "Damaged"], ["C", 1, "Late"], ["C", 2, "Late"]],
+    )
+
+
+def test_join_on_several_keys(host):
+    from trexjacket.model.query import join
+
+    records = list(join([_lines(), _returns()], ["Order ID", "Line"]))
+
+    assert records == [
+        {"Order ID": "A", "Line": 2, "Product": "Desk", "Reason": "Damaged"},
+        {"Order ID": "C", "Line": 1, "Product": "Lamp", "Reason": "Late"},
+    ]
+
+
+def test_join_keeps_only_rows_in_every_table(host):
+    from trexjacket.model.query import join
+
+    records = join(
+        [_table(*ORDERS), _lines(), _returns()], ["Order ID"], ["Order ID", "Reason"]
+    )
+
+    assert sorted((r["Order ID"], r["Reason"]) for r in records) == [
+        ("A", "Damaged"),
+        ("A", "Damaged"),
+        ("C", "Late"),
+        ("C", "Late"),
+    ]
+
+
+def test_join_shared_columns_come_from_the_first_table(host):
+    from trexjacket.model.query import join
+
+    records = join([_returns(), _lines()], ["Order ID"], ["Order ID", "Line"])
+
+    assert sorted((r["Order ID"], r["Line"]) for r in records) == [
+        ("A", 2),
+        ("A", 2),
+        ("C", 1),
+        ("C", 2),
+    ]
+
+
+def test_join_on_a_missing_column_fails_at_once(host):
+    from trexjacket.model.query import join
+
+    with pytest.raises(KeyError):
+        join([_lines(), _table(*ORDERS)], ["Order ID", "Line"])
+
+
+def test_datasource_join_tables(host):
+    lines = mock_tableau.DataTable(
+        [("Order ID", "string"), ("Product", "string")], [["A", "Chair"]]
+    )
+    returns = mock_tableau.DataTable(
+        [("Order ID", "string"), ("Reason", "string")],
+        [["A", "Damaged"], ["B", "Late"]],
+    )
+    datasource = mock_tableau.Datasource(
+        host, "Orders", {"Lines_1": lines, "Returns_2": returns}
+    )
+    host.dashboard.add_worksheet("Sales", datasources=[datasource])
+    from trexjacket import api
+
+    (ds,) = api.get_dashboard().get_worksheet("Sales").datasources
+
+    assert list(ds.join_tables(["Lines_1", "Returns_2"], on="Order ID")) == [
+        {"Order ID": "A", "Product": "Chair", "Reason": "Damaged"}
+    ]
+    with pytest.raises(KeyError):
+        ds.join_tables(["Lines_1", "Returns_2"], on="Product")
+    with pytest.raises(ValueError):
+        ds.join_tables(["Lines_1"], on="Order ID")
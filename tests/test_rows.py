@@ -0,0 +1,68 @@
+import datetime as dt
+
+from benchmarks import mock_tableau, synthetic
+
+
+def test_compact_rows_match_records(host):
+    from trexjacket.model.proxies import DataTable
+
+    table = DataTable(synthetic.make_table(20))
+
+    records = table.get_records()
+    rows = table.get_records(compact=True)
+
+    assert rows == records
+    assert [dict(row) for row in rows] == records
+    assert table.get_rows() == records
+    assert rows[0]._schema is rows[-1]._schema
+
+
+def test_row_mapping_interface(host):
+    from trexjacket.model.rows import Schema
+
+    row = Schema(["Region", "Sales"]).row(["West", 1.5])
+
+    assert row["Region"] == "West"
+    assert row.get("Profit", 0) == 0
+    assert "Sales" in row and "Profit" not in row
+    assert list(row) == row.keys() == ["Region", "Sales"]
+    assert row.values() == ["West", 1.5]
+    assert row.items() == [("Region", "West"), ("Sales", 1.5)]
+    assert len(row) == 2
+    assert row != {"Region": "East", "Sales": 1.5}
+
+
+def test_compact_fills_missing_keys(host):
+    from trexjacket.model.rows import compact
+
+    rows = compact([{"a": 1}, {"b": dt.date(2020, 1, 1)}])
+
+    assert rows == [{"a": 1, "b": None}, {"a": None, "b": dt.date(2020, 1, 1)}]
+
+
+def test_compact_summary_data(host):
+    host.dashboard.add_worksheet(
+        "Sales",
+        summary=mock_tableau.DataTable(
+            [
+                ("Region", "string"),
+                ("Measure Names", "string"),
+                ("Measure Values", "float"),
+            ],
+            [
+                ["East", mock_tableau.DataValue("[Sales]", "Sales"), 1.0],
+                ["East", mock_tableau.DataValue("[Profit]", "Profit"), 2.0],
+                ["West", mock_tableau.DataValue("[Sales]", "Sales"), 3.0],
+                ["West", mock_tableau.DataValue("[Profit]", "Profit"), None],
+            ],
+            is_summary=True,
+        ),
+    )
+    from trexjacket import api
+
+    worksheet = api.get_dashboard().get_worksheet("Sales")
+
+    assert worksheet.get_summary_data(compact=True) == worksheet.get_summary_data()
+    assert worksheet.get_summary_data(
+        collapse_measures=True, compact=True
+    ) == worksheet.get_summary_data(collapse_measures=True)
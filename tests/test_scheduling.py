@@ -0,0 +1,99 @@
+import pytest
+
+
+class _Event:
+    def __init__(self, n, token=None):
+        self.n = n
+        self.token = token
+
+    def _with_token(self, token):
+        return _Event(self.n, token)
+
+
+def _latest_wins(handler):
+    from trexjacket.model.scheduling import LatestWins
+
+    return LatestWins(handler)
+
+
+def test_only_the_latest_queued_event_is_handled(host):
+    handled = []
+
+    def handler(event):
+        handled.append(event.n)
+        if event.n == 1:
+            scheduler(_Event(2))
+            scheduler(_Event(3))
+            assert event.token.cancelled
+
+    scheduler = _latest_wins(handler)
+    scheduler(_Event(1))
+
+    assert handled == [1, 3]
+
+
+def test_cancelled_runs_stop_quietly(host):
+    handled = []
+
+    def handler(event):
+        if event.n == 1:
+            scheduler(_Event(2))
+            event.token.raise_if_cancelled()
+        handled.append(event.n)
+
+    scheduler = _latest_wins(handler)
+    scheduler(_Event(1))
+
+    assert handled == [2]
+
+
+def test_errors_do_not_leave_stale_events_queued(host):
+    handled = []
+
+    def handler(event):
+        handled.append(event.n)
+        if event.n == 1:
+            scheduler(_Event(2))
+            raise RuntimeError("failed")
+
+    scheduler = _latest_wins(handler)
+    with pytest.raises(RuntimeError):
+        scheduler(_Event(1))
+    scheduler(_Event(3))
+
+    assert handled == [1, 2, 3]
+
+
+def test_cancellation_token(host):
+    from trexjacket.exceptions import EventCancelled
+    from trexjacket.model.scheduling import CancellationToken
+
+    token = CancellationToken()
+    token.raise_if_cancelled()
+    token.cancel()
+
+    with pytest.raises(EventCancelled):
+        token.raise_if_cancelled()
+
+
+def test_unknown_policy(host):
+    from trexjacket.model.scheduling import scheduled
+
+    with pytest.raises(ValueError):
+        scheduled(print, "earliest")
+
+
+def test_data_methods_stop_once_cancelled(host):
+    from benchmarks import synthetic
+
+    host.dashboard.add_worksheet("Sales", summary=synthetic.make_table(5000))
+    from trexjacket import api
+    from trexjacket.exceptions import EventCancelled
+    from trexjacket.model.scheduling import CancellationToken
+
+    worksheet = api.get_dashboard().get_worksheet("Sales")
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(EventCancelled):
+        worksheet.get_summary_data(token=token)
@@ -0,0 +1,118 @@
+from benchmarks import mock_tableau, synthetic
+
+
+class _CountingBackend:
+    def __init__(self):
+        self.items = {}
+        self.writes = 0
+
+    def get(self, key):
+        return self.items.get(key)
+
+    def put(self, key, value):
+        self.writes += 1
+        self.items[key] = value
+
+    def delete(self, key):
+        self.items.pop(key, None)
+
+
+def _cache(backend=None):
+    from trexjacket.model.storage import TableCache
+
+    return TableCache(backend=backend or _CountingBackend())
+
+
+def _datasource(host, extract_update_time=None):
+    return mock_tableau.Datasource(
+        host,
+        "Orders",
+        {"Orders_1": synthetic.make_table(10)},
+        extract_update_time=extract_update_time,
+    )
+
+
+def _fetcher(host, datasource):
+    return lambda: datasource.getLogicalTableDataAsync("Orders_1")
+
+
+def test_extract_tables_are_fresh_until_the_extract_changes(host):
+    datasource = _datasource(host, "2024-01-01")
+    backend = _CountingBackend()
+    fetch = _fetcher(host, datasource)
+    _cache(backend).get(datasource, "Orders_1", fetch)
+
+    # A new page load, with a new cache over the same storage.
+    _cache(backend).get(datasource, "Orders_1", fetch)
+    host.run_timers()
+    assert host.calls["getLogicalTableDataAsync"] == 1
+
+    datasource.extractUpdateTime = "2024-01-02"
+    _cache(backend).get(datasource, "Orders_1", fetch)
+    host.run_timers()
+    assert host.calls["getLogicalTableDataAsync"] == 2
+
+
+def test_live_tables_are_always_revalidated(host):
+    datasource = _datasource(host)
+    backend = _CountingBackend()
+    fetch = _fetcher(host, datasource)
+    cache = _cache(backend)
+    cache.get(datasource, "Orders_1", fetch)
+    cache.refreshed(datasource.id)
+
+    for _ in range(2):
+        _cache(backend).get(datasource, "Orders_1", fetch)
+        host.run_timers()
+
+    assert host.calls["getLogicalTableDataAsync"] == 3
+
+
+def test_refresh_without_cached_tables_stores_nothing(host):
+    backend = _CountingBackend()
+    _cache(backend).refreshed("federated.orders")
+
+    assert backend.writes == 0
+
+
+def test_datasource_refresh_leaves_unused_cache_alone(host):
+    datasource = _datasource(host)
+    host.dashboard.add_worksheet("Sales", datasources=[datasource])
+    from trexjacket import api
+    from trexjacket.model.proxies import _Tableau
+
+    api.get_dashboard().get_worksheet("Sales").datasources[0].refresh()
+
+    assert _Tableau.session()._tables is None
+
+
+def test_failed_background_fetch_is_reported(host, capsys):
+    datasource = _datasource(host)
+    cache = _cache()
+    cache.get(datasource, "Orders_1", _fetcher(host, datasource))
+
+    def fail():
+        raise RuntimeError("offline")
+
+    table = cache.get(datasource, "Orders_1", fail)
+    host.run_timers()
+
+    assert len(table.data) == 10
+    assert "offline" in capsys.readouterr().out
+    assert cache._revalidating == set()
+
+
+def test_reads_save_the_index_once(host):
+    datasource = _datasource(host, "2024-01-01")
+    backend = _CountingBackend()
+    cache = _cache(backend)
+    fetch = _fetcher(host, datasource)
+    cache.get(datasource, "Orders_1", fetch)
+    writes = backend.writes
+
+    for _ in range(5):
+        cache.get(datasource, "Orders_1", fetch)
+    assert backend.writes == writes
+    host.run_timers()
+
+    assert backend.writes == writes + 1
@@ -0,0 +1,141 @@
+import datetime as dt
+
+import pytest
+
+from benchmarks import synthetic
+
+
+def _serve_uploads(host):
+    from server_code import uploads
+
+    for name in ("start", "chunk", "finish"):
+        function = getattr(uploads, f"trexjacket_upload_{name}")
+        host.server_functions[function.__name__] = function
+    return uploads
+
+
+def _source(rows):
+    from trexjacket.model.proxies import DataTable
+
+    return DataTable(synthetic.make_table(rows))
+
+
+def test_upload_reassembles_columns(host):
+    uploads = _serve_uploads(host)
+    received = []
+
+    @uploads.handler
+    def store(columns):
+        received.append(columns)
+        return "ok"
+
+    source = _source(50)
+    from trexjacket.uploads import Uploader
+
+    result = Uploader(max_chunk_bytes=500).upload(source, handler="store")
+
+    assert result == "ok"
+    (columns,) = received
+    records = source.get_records()
+    assert columns["Order ID"] == [r["Order ID"] for r in records]
+    assert columns["Order Date"] == [r["Order Date"] for r in records]
+    assert host.calls["server:trexjacket_upload_chunk"] > 1
+    assert len(host.app_tables.trexjacket_uploads) == 0
+
+
+def test_upload_without_handler_is_kept_until_assembled(host):
+    uploads = _serve_uploads(host)
+    from trexjacket.uploads import Uploader
+
+    upload_id = Uploader(max_chunk_bytes=500).upload(_source(20))
+
+    assert len(uploads.assemble(upload_id)["Region"]) == 20
+    with pytest.raises(KeyError):
+        uploads.assemble(upload_id)
+
+
+def test_failed_chunks_are_retried(host):
+    uploads = _serve_uploads(host)
+    chunk = host.server_functions["trexjacket_upload_chunk"]
+    failures = [RuntimeError("lost"), RuntimeError("lost")]
+
+    def flaky_chunk(*args):
+        if failures:
+            raise failures.pop()
+        return chunk(*args)
+
+    host.server_functions["trexjacket_upload_chunk"] = flaky_chunk
+
+    @uploads.handler
+    def store(columns):
+        return len(columns["Region"])
+
+    from trexjacket.uploads import Uploader
+
+    uploader = Uploader(max_in_flight=1, retries=2, retry_delay=0)
+
+    assert uploader.upload(_source(10), handler="store") == 10
+
+
+def test_overlapping_uploads_report_their_own_progress(host):
+    _serve_uploads(host)
+    progress = []
+    from trexjacket.uploads import Uploader
+
+    def on_progress(sent, total):
+        progress.append((sent, total))
+        if len(progress) == 1:
+            uploader.upload(_source(3))
+
+    uploader = Uploader(max_chunk_bytes=500, on_progress=on_progress)
+    uploader.upload(_source(10))
+
+    small = [p for p in progress if p[1] == 3]
+    large = [p for p in progress if p[1] == 10]
+    assert small[-1] == (3, 3)
+    assert large[-1] == (10, 10)
+    assert [sent for sent, _ in large] == sorted(sent for sent, _ in large)
+
+
+def test_expired_uploads_are_deleted(host):
+    uploads = _serve_uploads(host)
+    from trexjacket.uploads import Uploader
+
+    stale_id = Uploader().upload(_source(5))
+    for row in host.app_tables.trexjacket_uploads.rows:
+        row["created"] -= uploads.EXPIRY + dt.timedelta(minutes=1)
+
+    fresh_id = Uploader().upload(_source(5))
+
+    with pytest.raises(KeyError):
+        uploads.assemble(stale_id)
+    assert len(uploads.assemble(fresh_id)["Region"]) == 5
+
+
+def test_uploads_belong_to_their_session(host):
+    import anvil.server
+
+    uploads = _serve_uploads(host)
+    upload_id = uploads.trexjacket_upload_start(["Region"], ["string"])
+    uploads.trexjacket_upload_chunk(upload_id, 0, [["West"]])
+    other_id = uploads.trexjacket_upload_start(["Region"], ["string"])
+    assert other_id != upload_id
+
+    anvil.server.session = {}
+
+    with pytest.raises(KeyError):
+        uploads.trexjacket_upload_chunk(upload_id, 1, [["East"]])
+    with pytest.raises(KeyError):
+        uploads.trexjacket_upload_finish(upload_id, 1)
+    assert uploads.assemble(upload_id) == {"Region": ["West"]}
+
+
+def test_only_registered_handlers_are_called(host):
+    _serve_uploads(host)
+    called = []
+    host.server_functions["delete_everything"] = lambda columns: called.append(columns)
+    from trexjacket.uploads import Uploader
+
+    with pytest.raises(KeyError):
+        Uploader().upload(_source(5), handler="delete_everything")
+    assert called == []
@@ -0,0 +1,122 @@
+import datetime as dt
+
+import pytest
+
+
+def _queue(host, **kwargs):
+    from trexjacket.writeback import WritebackQueue
+
+    return WritebackQueue("save", **kwargs)
+
+
+def _save_to(host, batches):
+    host.server_functions["save"] = batches.append
+
+
+def test_edits_are_combined_and_sent_in_batches(host):
+    batches = []
+    _save_to(host, batches)
+    queue = _queue(host, max_batch=2)
+
+    queue.put("a", 1)
+    queue.put("b", 2)
+    queue.put("a", 3)
+    queue.put("c", 4)
+    host.run_timers()
+
+    assert batches == [[["b", 2], ["a", 3]], [["c", 4]]]
+    assert queue.pending == {}
+    assert queue.stats["edits"] == 3
+    assert queue.stats["calls"] == 2
+    assert host.local_storage.items == {}
+
+
+def test_unsent_edits_are_restored_after_a_reload(host):
+    batches = []
+    _save_to(host, batches)
+    key = ("id", dt.date(2020, 1, 1))
+    _queue(host).put(key, {"value": 1, "on": dt.date(2020, 2, 1)})
+    host.timers.clear()
+
+    reloaded = _queue(host)
+    assert reloaded.pending == {key: {"value": 1, "on": dt.date(2020, 2, 1)}}
+    reloaded.put(key, {"value": 2, "on": dt.date(2020, 2, 1)})
+    host.run_timers()
+
+    assert batches == [[[key, {"value": 2, "on": dt.date(2020, 2, 1)}]]]
+
+
+def test_queues_of_different_functions_keep_their_own_edits(host):
+    from trexjacket.writeback import WritebackQueue
+
+    batches = {"save_a": [], "save_b": []}
+    for name, received in batches.items():
+        host.server_functions[name] = received.append
+    WritebackQueue("save_a").put("x", 1)
+    WritebackQueue("save_b").put("x", 2)
+    host.timers.clear()
+
+    reloaded_a = WritebackQueue("save_a")
+    reloaded_b = WritebackQueue("save_b")
+    assert reloaded_a.pending == {"x": 1}
+    assert reloaded_b.pending == {"x": 2}
+    host.run_timers()
+
+    assert batches == {"save_a": [[["x", 1]]], "save_b": [[["x", 2]]]}
+    assert host.local_storage.items == {}
+
+
+def test_edits_in_flight_stay_stored_until_sent(host):
+    stored = []
+
+    def save(entries):
+        queue.put("b", 2)
+        stored.append(host.local_storage.items["trexjacket_writeback:save"])
+
+    host.server_functions["save"] = save
+    queue = _queue(host)
+    queue.put("a", 1)
+    queue.flush()
+
+    assert stored == ['[["a", 1], ["b", 2]]']
+    assert host.local_storage.items["trexjacket_writeback:save"] == '[["b", 2]]'
+
+
+def test_failed_flush_is_retried_with_backoff(host):
+    batches = []
+    failures = [RuntimeError("offline"), RuntimeError("offline")]
+
+    def save(entries):
+        if failures:
+            raise failures.pop()
+        batches.append(entries)
+
+    host.server_functions["save"] = save
+    queue = _queue(host, window=1.0)
+    queue.put("a", 1)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            host.run_timers()
+        assert queue.pending == {"a": 1}
+    host.run_timers()
+
+    assert batches == [[["a", 1]]]
+    assert host.delays == [1000, 2000, 4000]
+    assert queue.stats["failures"] == 2
+
+
+def test_failed_edits_do_not_replace_newer_ones(host):
+    def save(entries):
+        queue.put("a", 2)
+        raise RuntimeError("offline")
+
+    host.server_functions["save"] = save
+    queue = _queue(host)
+    queue.put("a", 1)
+    queue.put("b", 1)
+
+    with pytest.raises(RuntimeError):
+        queue.flush()
+
+    assert queue.pending == {"a": 2, "b": 1}